@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+from functools import cached_property
+from deliveries import BallArrays
+
+# Pluggable per-(season, player) stats computed from the delivery tables.
+# The archive is decoded once into those tables; every registered aggregator
+# then reads the same ScanContext, so a new stat costs only its own array
+# work, never another pass over the match JSON.
+#
+#   @register
+#   class DotBalls(Aggregator):
+#       name = 'dot_balls'
+#       columns = ['dots_faced']
+#       def per_delivery(self, ctx, out):
+#           out.add('dots_faced', ctx.bat_key[ctx.faced & (ctx.runs_batter == 0)])
+#
+# per_delivery() sees one entry per ball; per_match() sees one entry per
+# (match, player) via ctx.match_batting / ctx.match_bowling, for stats that
+# depend on a player's whole innings (ducks, 3-wicket hauls, ...).
+
+# 0-based over ranges for a T20 innings
+PHASES = {'powerplay': (0, 6), 'middle': (6, 15), 'death': (15, 20)}
+
+AGGREGATORS = []
+
+
+def register(cls):
+    AGGREGATORS.append(cls)
+    return cls
+
+
+class Aggregator:
+    name = None
+    columns = []
+
+    def per_delivery(self, ctx, out):
+        pass
+
+    def per_match(self, ctx, out):
+        pass
+
+
+class ScanContext(BallArrays):
+    # Arrays shared by every aggregator: the per-ball arrays from
+    # deliveries.BallArrays plus player keys. Keys are season_id * n_players
+    # + player_id, the same encoding aggregate_season_stats uses.
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        d, f = tables['deliveries'], tables['fielders']
+        self.tables = tables
+
+        self.over = d['over'].to_numpy(np.int64)
+        self.bat_key = self.season * self.n_players + self.batter
+        self.bowl_key = self.season * self.n_players + self.bowler
+        self.w_out_key = self.season[self.w_idx] * self.n_players + self.w_out
+
+        f_idx = f['delivery_idx'].to_numpy(np.int64)
+        self.f_key = self.season[f_idx] * self.n_players + f['fielder_id'].to_numpy(np.int64)
+
+        # Every (season, player) that appears on a ball in any role
+        self.keys = np.unique(np.concatenate([self.bat_key, self.bowl_key, self.f_key, self.w_out_key]))
+
+    def phase(self, name):
+        start, stop = PHASES[name]
+        return (self.over >= start) & (self.over < stop)
+
+    def _per_match(self, player, extra_players=()):
+        # (match, player) pairs -> index per entry, plus each pair's season key
+        pair = np.concatenate([self.match * self.n_players + player, *extra_players])
+        pairs, inverse = np.unique(pair, return_inverse=True)
+        match_of = pairs // self.n_players
+        season_of = self._match_season()[match_of]
+        return inverse, season_of * self.n_players + pairs % self.n_players
+
+    def _match_season(self):
+        out = np.zeros(len(self.tables['matches']), dtype=np.int64)
+        out[self.match] = self.season
+        return out
+
+    @cached_property
+    def match_batting(self):
+        # One row per (match, batter or dismissed player): runs, balls, out
+        out_pair = self.match[self.w_idx] * self.n_players + self.w_out
+        inverse, key = self._per_match(self.batter, [out_pair])
+        n, n_balls = len(key), len(self.batter)
+        at = inverse[:n_balls]
+        return pd.DataFrame({
+            'key': key,
+            'runs': np.bincount(at, self.runs_batter, minlength=n).astype(np.int64),
+            'balls': np.bincount(at[self.faced], minlength=n),
+            'out': np.bincount(inverse[n_balls:], minlength=n) > 0,
+        })
+
+    @cached_property
+    def match_bowling(self):
+        # One row per (match, bowler): legal balls, runs conceded, wickets
+        inverse, key = self._per_match(self.bowler)
+        n = len(key)
+        wkt_at = inverse[self.w_idx[self.bowler_wicket]]
+        return pd.DataFrame({
+            'key': key,
+            'balls': np.bincount(inverse[self.legal], minlength=n),
+            'runs': np.bincount(inverse, self.conceded, minlength=n).astype(np.int64),
+            'wickets': np.bincount(wkt_at, minlength=n),
+        })
+
+
+class Totals:
+    # Output columns for one run, one slot per ctx.keys entry
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.columns = {}
+
+    def add(self, column, keys, weights=None):
+        pos = np.searchsorted(self.keys, keys)
+        counts = np.bincount(pos, weights=weights, minlength=len(self.keys)).astype(np.int64)
+        if column in self.columns:
+            self.columns[column] += counts
+        else:
+            self.columns[column] = counts
+
+
+def run_aggregators(tables, aggregators=None, timer=None, ctx=None):
+    # -> DataFrame of name, season and every aggregator's columns
+    ctx = ScanContext(tables) if ctx is None else ctx
+    out = Totals(ctx.keys)
+    for cls in aggregators or AGGREGATORS:
+        agg = cls()
+        if timer is None:
+            agg.per_delivery(ctx, out)
+            agg.per_match(ctx, out)
+        else:
+            with timer(agg.name):
+                agg.per_delivery(ctx, out)
+                agg.per_match(ctx, out)
+        for col in agg.columns:
+            out.columns.setdefault(col, np.zeros(len(ctx.keys), dtype=np.int64))
+
+    seasons = tables['seasons']['season'].to_numpy()
+    names = tables['players']['name'].to_numpy()
+    df = pd.DataFrame({
+        'name': names[ctx.keys % ctx.n_players] if len(ctx.keys) else [],
+        'season': seasons[ctx.keys // ctx.n_players] if len(ctx.keys) else [],
+    })
+    for col, values in out.columns.items():
+        df[col] = values
+    return df.sort_values(['season', 'name'], kind='stable').reset_index(drop=True)
+
+
+# --- BUILT-IN AGGREGATORS ---
+
+@register
+class PhaseSplits(Aggregator):
+    name = 'phase_splits'
+    columns = [f'{p}_{c}' for p in PHASES for c in ['runs', 'balls', 'runs_conceded', 'balls_bowled']]
+
+    def per_delivery(self, ctx, out):
+        for phase in PHASES:
+            in_phase = ctx.phase(phase)
+            out.add(f'{phase}_runs', ctx.bat_key[in_phase], ctx.runs_batter[in_phase])
+            out.add(f'{phase}_balls', ctx.bat_key[in_phase & ctx.faced])
+            out.add(f'{phase}_runs_conceded', ctx.bowl_key[in_phase], ctx.conceded[in_phase])
+            out.add(f'{phase}_balls_bowled', ctx.bowl_key[in_phase & ctx.legal])
+
+
+@register
+class DotBalls(Aggregator):
+    name = 'dot_balls'
+    columns = ['dots_faced', 'dots_bowled']
+
+    def per_delivery(self, ctx, out):
+        out.add('dots_faced', ctx.bat_key[ctx.faced & (ctx.runs_batter == 0)])
+        out.add('dots_bowled', ctx.bowl_key[ctx.legal & (ctx.conceded == 0)])
+
+
+@register
+class Boundaries(Aggregator):
+    name = 'boundaries'
+    columns = ['boundaries_hit', 'boundaries_conceded']
+
+    def per_delivery(self, ctx, out):
+        boundary = (ctx.runs_batter == 4) | (ctx.runs_batter == 6)
+        out.add('boundaries_hit', ctx.bat_key[boundary])
+        out.add('boundaries_conceded', ctx.bowl_key[boundary])
+
+
+@register
+class Dismissals(Aggregator):
+    # How each batter got out, one column per dismissal kind
+    name = 'dismissals'
+    columns = []
+
+    def per_delivery(self, ctx, out):
+        for kind in np.unique(ctx.w_kind):
+            col = 'out_' + str(kind).replace(' ', '_')
+            out.add(col, ctx.w_out_key[ctx.w_kind == kind])
+
+
+@register
+class Milestones(Aggregator):
+    name = 'milestones'
+    columns = ['ducks', 'scores_30_plus', 'three_wicket_hauls']
+
+    def per_match(self, ctx, out):
+        bat, bowl = ctx.match_batting, ctx.match_bowling
+        out.add('ducks', bat['key'][bat['out'] & (bat['runs'] == 0)].to_numpy())
+        out.add('scores_30_plus', bat['key'][bat['runs'] >= 30].to_numpy())
+        out.add('three_wicket_hauls', bowl['key'][bowl['wickets'] >= 3].to_numpy())
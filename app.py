@@ -1,8 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
+from artifacts import load_frames
+from loaders import build_dashboard_frames, dataset_partitions
+from player_index import PlayerStore, AuctionStore
+from valuation import calculate_valuation, value_roster, simulate_valuation, valuation_bands
+from leaderboard import Leaderboards
+from similarity import SimilarityIndex, latest_prices
+from matchups import MatchupStore, load_matchups, MATCHUPS_PATH
+from form import FormIndex, load_player_matches
+from figure_cache import FigureCache, data_version
+from squad import SquadOptimizer, ROLES, DEFAULT_PURSE, DEFAULT_SQUAD_SIZE, DEFAULT_ROLE_MINIMUMS, DEFAULT_OVERSEAS_CAP
+import profiling
+from profiling import track_cache
 
 st.set_page_config(
     page_title="IPL Moneyball: Premium Analytics",
@@ -11,6 +21,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+profiling.begin_run()
+
 st.markdown("""
     <style>
     :root {
@@ -77,134 +89,93 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_dashboard_data():
-    # 1. Load Season Data (Ball-by-ball aggregated)
-    try:
-        df = pd.read_csv('season_data.csv')
-        df['season'] = df['season'].astype(str)
-    except FileNotFoundError:
-        return None, None
-
-    # Calculate Season Metrics
-    df['batting_avg'] = df.apply(lambda x: x['runs_scored'] / (x['matches'] - x['not_outs']) if (x['matches'] - x['not_outs']) > 0 else x['runs_scored'], axis=1)
-    df['batting_sr'] = df.apply(lambda x: (x['runs_scored'] / x['balls_faced']) * 100 if x['balls_faced'] > 0 else 0, axis=1)
-    df['bowling_economy'] = df.apply(lambda x: x['runs_conceded'] / (x['balls_bowled']/6) if x['balls_bowled'] > 0 else 0, axis=1)
-
-    # 2. Load Master Data (For accurate 100s, 50s, 4s, 6s, 5w)
-    try:
-        master_data = pd.read_csv('master_data.csv')
-        # Ensure we have the specific columns needed
-        cols_to_merge = ['name', 'centuries', 'fifties', 'sixes', 'fours', '5_wickets']
-        master_subset = master_data[cols_to_merge].copy()
-    except (FileNotFoundError, KeyError):
-        master_subset = pd.DataFrame(columns=['name', 'centuries', 'fifties', 'sixes', 'fours', '5_wickets'])
-
-    # 3. Aggregation
-    sum_cols = ['matches', 'runs_scored', 'balls_faced', 'wickets', 'balls_bowled', 'runs_conceded', 'catches']
-    career_df = df.groupby('name')[sum_cols].sum().reset_index()
-
-    # 4. Merge Correct Stats from Master Data
-    # We drop these columns if they exist in career_df to avoid duplication before merge
-    for c in ['centuries', 'fifties', 'sixes', 'fours', '5_wickets']:
-        if c in career_df.columns:
-            career_df.drop(columns=[c], inplace=True)
-            
-    if not master_subset.empty:
-        career_df = pd.merge(career_df, master_subset, on='name', how='left')
-        # Fill NaNs with 0 for players present in season data but not master data
-        career_df[['centuries', 'fifties', 'sixes', 'fours', '5_wickets']] = career_df[['centuries', 'fifties', 'sixes', 'fours', '5_wickets']].fillna(0)
-    else:
-        # Fallback if master_data isn't found
-        career_df['centuries'] = 0
-        career_df['fifties'] = 0
-        career_df['sixes'] = 0
-        career_df['fours'] = 0
-        career_df['5_wickets'] = 0
-
-    # Career Derived Metrics
-    career_df['batting_avg'] = round(career_df['runs_scored'] / career_df['matches'], 2) 
-    career_df['batting_sr'] = career_df.apply(lambda x: round((x['runs_scored'] / x['balls_faced']) * 100, 2) if x['balls_faced'] > 0 else 0, axis=1)
-    career_df['bowling_economy'] = career_df.apply(lambda x: round(x['runs_conceded'] / (x['balls_bowled']/6), 2) if x['balls_bowled'] > 0 else 0, axis=1)
-    career_df['all_rounder_score'] = career_df['runs_scored'] + (career_df['wickets'] * 25)
-
-    # Normalize for Radar
-    for col in ['batting_avg', 'batting_sr', 'runs_scored', 'wickets']:
-        max_val = career_df[col].quantile(0.99)
-        if max_val == 0: max_val = 1
-        career_df[f'norm_{col}'] = (career_df[col] / max_val).clip(0, 1)
-    
-    career_df['norm_bowling_economy'] = 1 - ((career_df['bowling_economy'] - 5) / (12 - 5)).clip(0, 1)
-
-    return df, career_df
-
-@st.cache_data
+# League/season slices cached at once, per slice-keyed resource; the least
+# recently used slice is dropped past that, so memory follows the slices in
+# use rather than every slice ever viewed
+SLICE_CACHE_ENTRIES = 8
+
+@track_cache(st.cache_resource(max_entries=SLICE_CACHE_ENTRIES))
+def load_dashboard_data(leagues=None, seasons=None):
+    # Shared read-only across sessions. The default (season_data.csv) frames
+    # are served from artifacts/; a league/season slice reads just those
+    # partitions of the season dataset, and each slice is cached separately.
+    if leagues is None and seasons is None:
+        return load_frames('dashboard')
+    return build_dashboard_frames(leagues=leagues, seasons=seasons)
+
+@track_cache(st.cache_resource(max_entries=SLICE_CACHE_ENTRIES))
+def load_leaderboards(leagues=None, seasons=None):
+    season_df, _ = load_dashboard_data(leagues, seasons)
+    return None if season_df is None else Leaderboards(season_df)
+
+# Two bases (career, season) per slice
+@track_cache(st.cache_resource(max_entries=2 * SLICE_CACHE_ENTRIES))
+def load_similarity_index(basis='career', leagues=None, seasons=None):
+    season_df, career_df = load_dashboard_data(leagues, seasons)
+    if season_df is None:
+        return None
+    return SimilarityIndex.for_careers(career_df) if basis == 'career' else SimilarityIndex.for_seasons(season_df)
+
+@track_cache(st.cache_resource)
+def load_player_prices():
+    # Last auction price per Cricsheet name; pulls in the ML data on first use
+    df_master, _ = load_ml_data()
+    identity = load_player_identity()
+    return pd.Series(dtype=float) if df_master is None or identity is None else latest_prices(df_master, identity)
+
+@track_cache(st.cache_resource)
+def load_matchup_store():
+    df = load_matchups()
+    return None if df is None else MatchupStore(df)
+
+@track_cache(st.cache_resource)
+def load_form_index():
+    df = load_player_matches()
+    return None if df is None else FormIndex(df)
+
+@track_cache(st.cache_resource)
+def load_cricsheet_names():
+    # Resolved identifier -> Cricsheet name, to find a stats-sheet player in the form index
+    identity = load_player_identity()
+    if identity is None:
+        return {}
+    ids = identity.dropna(subset=['identifier']).drop_duplicates('identifier')
+    return dict(zip(ids['identifier'], ids['name']))
+
+@track_cache(st.cache_data(max_entries=256))
+def simulate_prices(player, runs, wickets, matches, last_price):
+    # Keyed on the player and slider values, so revisiting a setting is instant
+    history = None if player == "Custom Profile" else load_auction_store().stat_rows(player)
+    return simulate_valuation(runs, wickets, matches, last_price=last_price, history=history)
+
+@track_cache(st.cache_resource)
+def load_figure_cache():
+    # One figure cache for the whole server process
+    return FigureCache()
+
+@track_cache(st.cache_resource)
 def load_ml_data():
-    try:
-        master_df = pd.read_csv('IPL_Master_Player_Data copy.csv')
-        stats_df = pd.read_csv('cricket_data copy.csv')
-        
-        master_df['Price'] = pd.to_numeric(master_df['Price'], errors='coerce').fillna(0)
-        master_df['Year'] = pd.to_numeric(master_df['Year'], errors='coerce')
-        master_df = master_df.dropna(subset=['Year'])
-        master_df = master_df[master_df['Price'] > 0]
+    return load_frames('ml')
 
-        stats_df['Year'] = pd.to_numeric(stats_df['Year'], errors='coerce')
-        stats_df = stats_df.dropna(subset=['Year'])
-        
-        cols_to_clean = ['Runs_Scored', 'Wickets_Taken', 'Batting_Strike_Rate',
-                        'Bowling_Average', 'Economy_Rate', 'Matches_Batted']
-        for col in cols_to_clean:
-            if col in stats_df.columns:
-                stats_df[col] = pd.to_numeric(
-                    stats_df[col].astype(str).str.replace(r'[^\d.]', '', regex=True),
-                    errors='coerce'
-                ).fillna(0)
-
-        master_df['join_name'] = master_df['Player'].str.lower().str.strip()
-        stats_df['join_name'] = stats_df['Player_Name'].str.lower().str.strip()
-        
-        return master_df, stats_df
-        
-    except FileNotFoundError:
-        return None, None
+@track_cache(st.cache_resource)
+def load_player_identity():
+    # Identifier keys are only needed for auction prices and form lookups, so they load on first use
+    return load_frames('identity')[0]
 
-season_df, career_df = load_dashboard_data()
-df_master, df_stats = load_ml_data()
+@track_cache(st.cache_resource(max_entries=SLICE_CACHE_ENTRIES))
+def load_player_store(leagues=None, seasons=None):
+    season_df, career_df = load_dashboard_data(leagues, seasons)
+    return None if season_df is None else PlayerStore(season_df, career_df)
 
-def calculate_valuation(runs, wickets, matches, last_price=0):
-    IDEAL_BAT_RUNS = 973.0
-    IDEAL_BOWL_WKTS = 32.0
-    IDEAL_AR_RUNS = 510.0
-    IDEAL_AR_WKTS = 11.0
-    MAX_PRICE_CAP = 210000000.0
-
-    is_bowler = (wickets >= 12) or (wickets > matches * 0.8) if matches > 0 else False
-    is_allrounder = (runs > 200) and (wickets >= 6)
-    
-    role = "Batter"
-    perf_ratio = 0.0
-
-    if is_allrounder:
-        role = "All-Rounder"
-        bat_ratio = min(runs / IDEAL_AR_RUNS, 1.2) if IDEAL_AR_RUNS > 0 else 0
-        bowl_ratio = min(wickets / IDEAL_AR_WKTS, 1.2) if IDEAL_AR_WKTS > 0 else 0
-        perf_ratio = (bat_ratio * 0.6) + (bowl_ratio * 0.4)
-    elif is_bowler:
-        role = "Bowler"
-        perf_ratio = min(wickets / IDEAL_BOWL_WKTS, 1.1) if IDEAL_BOWL_WKTS > 0 else 0
-    else:
-        role = "Batter"
-        perf_ratio = min(runs / IDEAL_BAT_RUNS, 1.1) if IDEAL_BAT_RUNS > 0 else 0
+@track_cache(st.cache_resource)
+def load_auction_store():
+    df_master, df_stats = load_ml_data()
+    return None if df_stats is None else AuctionStore(df_master, df_stats)
 
-    base_perf_price = perf_ratio * MAX_PRICE_CAP
-    
-    if last_price > 0:
-        final_price = (0.70 * last_price) + (0.30 * base_perf_price)
-    else:
-        final_price = base_perf_price * 0.85
-        
-    return final_price, role, perf_ratio * 100
+@track_cache(st.cache_resource)
+def load_league_valuations():
+    df_master, df_stats = load_ml_data()
+    return None if df_stats is None else value_roster(df_stats, df_master)
 
 def format_price(price):
     if price >= 10000000: return f"₹ {price/10000000:.2f} Cr"
@@ -230,21 +201,55 @@ with st.sidebar:
     
     view_mode = st.radio(
         "Navigation", 
-        ["👤 Player 360° Profile", "🏆 Hall of Fame", "🤖 ML Valuation Engine"]
+        ["👤 Player 360° Profile", "🏆 Hall of Fame", "🤖 ML Valuation Engine", "📋 League Valuations", "⚔️ Head-to-Head", "🧮 Squad Optimizer"]
     )
+    show_perf = st.toggle("⏱️ Performance panel", value=False)
     st.markdown("---")
 
+    # League/season slice for the dashboard views; only offered once
+    # generate.py has written the partitioned season dataset. Everything
+    # selected is the default and stays on the artifacts/ frames; only a
+    # narrower selection reads partitions
+    data_slice = {}
+    partitions = dataset_partitions() if view_mode in ("👤 Player 360° Profile", "🏆 Hall of Fame") else pd.DataFrame()
+    if not partitions.empty:
+        all_leagues = sorted(partitions['league'].unique())
+        sel_leagues = st.multiselect("League", all_leagues, default=all_leagues)
+        available = sorted(partitions.loc[partitions['league'].isin(sel_leagues), 'season'].unique())
+        if len(available) > 1:
+            first, last = st.select_slider("Seasons", options=available, value=(available[0], available[-1]))
+            sel_seasons = [s for s in available if first <= s <= last]
+        else:
+            sel_seasons = available
+        if not sel_leagues or not sel_seasons:
+            st.warning("Select at least one league with data.")
+            st.stop()
+        if len(sel_leagues) < len(all_leagues) or len(sel_seasons) < partitions['season'].nunique():
+            data_slice = {'leagues': tuple(sel_leagues), 'seasons': tuple(sel_seasons)}
+        st.markdown("---")
+
+# Each view loads its own data (and plotting library) the first time it's
+# opened, so a session only pays for the views it actually visits
+
 if view_mode == "👤 Player 360° Profile":
     
-    if season_df is None:
+    lap = profiling.Lap('render:player_360')
+    players = load_player_store(**data_slice)
+    if players is None:
         st.error("Missing `season_data.csv`")
         st.stop()
+    if not players.names:
+        st.warning("No players in the selected leagues/seasons.")
+        st.stop()
 
-    player_list = sorted(career_df['name'].unique())
-    selected_player = st.sidebar.selectbox("🔍 Select Player", player_list)
+    import plotly.graph_objects as go
+    figures = load_figure_cache()
+    selected_player = st.sidebar.selectbox("🔍 Select Player", players.names)
+    fig_key = (data_version(players), selected_player)
     
-    p_career = career_df[career_df['name'] == selected_player].iloc[0]
-    p_season = season_df[season_df['name'] == selected_player].sort_values('season')
+    p_career = players.career_row(selected_player)
+    p_season = players.season_rows(selected_player)
+    lap.mark('lookup')
 
     col1, col2 = st.columns([1, 4])
     with col1:
@@ -262,6 +267,7 @@ if view_mode == "👤 Player 360° Profile":
             <span class='role-badge {badge_cls}'>{badge_txt}</span>
             <span style='color: #8b949e; margin-left: 10px;'>Matches: {p_career['matches']} • Active Seasons: {len(p_season)}</span>
         """, unsafe_allow_html=True)
+
     
     st.markdown("---")
 
@@ -282,8 +288,10 @@ if view_mode == "👤 Player 360° Profile":
     with m2: render_metric_card("Half Centuries", f"{fifties}", "5️⃣")
     with m3: render_metric_card("5-Wicket Hauls", f"{five_wickets}", "🖐️")
 
+    lap.mark('cards')
+
     st.markdown("### 📊 Performance Analytics")
-    tab1, tab2 = st.tabs(["📈 Career Trajectory", "🕸️ Skill Radar"])
+    tab1, tab2, tab3 = st.tabs(["📈 Career Trajectory", "🕸️ Skill Radar", "🧬 Similar Players"])
     
     with tab1:
         with st.container():
@@ -291,84 +299,185 @@ if view_mode == "👤 Player 360° Profile":
             col_chart1, col_chart2 = st.columns(2)
             
             with col_chart1:
-                fig_runs = go.Figure()
-                fig_runs.add_trace(go.Bar(
-                    x=p_season['season'], y=p_season['runs_scored'],
-                    name='Runs', marker=dict(color=p_season['runs_scored'], colorscale='Blues', showscale=False)
-                ))
-                fig_runs.update_layout(title='Runs per Season', height=600, template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-                st.plotly_chart(fig_runs, use_container_width=True)
+                def runs_chart():
+                    fig_runs = go.Figure()
+                    fig_runs.add_trace(go.Bar(
+                        x=p_season['season'], y=p_season['runs_scored'],
+                        name='Runs', marker=dict(color=p_season['runs_scored'], colorscale='Blues', showscale=False)
+                    ))
+                    fig_runs.update_layout(title='Runs per Season', height=600, template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+                    return fig_runs
+                st.plotly_chart(figures.get(('player360:runs', *fig_key), runs_chart), use_container_width=True)
                 
             with col_chart2:
-                fig_wkts = go.Figure()
-                fig_wkts.add_trace(go.Bar(
-                    x=p_season['season'], y=p_season['wickets'],
-                    name='Wickets', marker=dict(color=p_season['wickets'], colorscale='Reds', showscale=False)
-                ))
-                fig_wkts.update_layout(title='Wickets per Season', height=600, template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-                st.plotly_chart(fig_wkts, use_container_width=True)
+                def wickets_chart():
+                    fig_wkts = go.Figure()
+                    fig_wkts.add_trace(go.Bar(
+                        x=p_season['season'], y=p_season['wickets'],
+                        name='Wickets', marker=dict(color=p_season['wickets'], colorscale='Reds', showscale=False)
+                    ))
+                    fig_wkts.update_layout(title='Wickets per Season', height=600, template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+                    return fig_wkts
+                st.plotly_chart(figures.get(('player360:wickets', *fig_key), wickets_chart), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
+        lap.mark('trajectory_charts')
+
     with tab2:
         col_rad1, col_rad2 = st.columns([2, 1])
         with col_rad1:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            categories = ['Consistency', 'Aggression', 'Volume', 'Wicket Taking', 'Economy (Inv)']
-            values = [p_career['norm_batting_avg'], p_career['norm_batting_sr'], p_career['norm_runs_scored'], p_career['norm_wickets'], p_career['norm_bowling_economy']]
-            fig_radar = go.Figure(go.Scatterpolar(r=values, theta=categories, fill='toself', name=selected_player, line_color='#2ecc71'))
-            fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1], color='#8b949e')), showlegend=False, height=600, template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', title="360° Skill Assessment")
-            st.plotly_chart(fig_radar, use_container_width=True)
+            def radar_chart():
+                categories = ['Consistency', 'Aggression', 'Volume', 'Wicket Taking', 'Economy (Inv)']
+                values = [p_career['norm_batting_avg'], p_career['norm_batting_sr'], p_career['norm_runs_scored'], p_career['norm_wickets'], p_career['norm_bowling_economy']]
+                fig_radar = go.Figure(go.Scatterpolar(r=values, theta=categories, fill='toself', name=selected_player, line_color='#2ecc71'))
+                fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1], color='#8b949e')), showlegend=False, height=600, template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', title="360° Skill Assessment")
+                return fig_radar
+            st.plotly_chart(figures.get(('player360:radar', *fig_key), radar_chart), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col_rad2:
             st.markdown("#### Run Composition")
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            labels = ['Fours', 'Sixes', 'Running']
-            
-            fours_count = p_career.get('fours', 0)
-            sixes_count = p_career.get('sixes', 0)
-            total_runs = p_career.get('runs_scored', 0)
-            
-            run_4s = fours_count * 4
-            run_6s = sixes_count * 6
-            run_run = total_runs - (run_4s + run_6s)
-            
-            vals = [run_4s, run_6s, run_run]
-            fig_pie = go.Figure(go.Pie(labels=labels, values=vals, hole=.4, marker_colors=['#3498DB', '#E74C3C', '#F1C40F']))
-            fig_pie.update_layout(height=600, margin=dict(t=0,b=0,l=0,r=0), template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_pie, use_container_width=True)
+            def composition_chart():
+                labels = ['Fours', 'Sixes', 'Running']
+                
+                fours_count = p_career.get('fours', 0)
+                sixes_count = p_career.get('sixes', 0)
+                total_runs = p_career.get('runs_scored', 0)
+                
+                run_4s = fours_count * 4
+                run_6s = sixes_count * 6
+                run_run = total_runs - (run_4s + run_6s)
+                
+                vals = [run_4s, run_6s, run_run]
+                fig_pie = go.Figure(go.Pie(labels=labels, values=vals, hole=.4, marker_colors=['#3498DB', '#E74C3C', '#F1C40F']))
+                fig_pie.update_layout(height=600, margin=dict(t=0,b=0,l=0,r=0), template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_pie
+            st.plotly_chart(figures.get(('player360:composition', *fig_key), composition_chart), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
+    lap.mark('radar_charts')
+
+    with tab3:
+        sim1, sim2, sim3, sim4 = st.columns(4)
+        with sim1: sim_basis = st.selectbox("Compare", ["Career"] + [f"Season {s}" for s in p_season['season'].astype(str)[::-1]])
+        with sim2: sim_metric = st.radio("Metric", ["Cosine", "Euclidean"], horizontal=True)
+        with sim3: sim_k = st.slider("Players", 5, 50, 10)
+        with sim4: price_cap = st.number_input("Max last auction price (₹ Cr, 0 = any)", min_value=0.0, value=0.0, step=0.5)
+
+        if sim_basis == "Career":
+            sim_index, sim_key = load_similarity_index('career', **data_slice), selected_player
+        else:
+            sim_index, sim_key = load_similarity_index('season', **data_slice), (selected_player, sim_basis.split(' ', 1)[1])
+
+        names = pd.Series([k if isinstance(k, str) else k[0] for k in sim_index.keys])
+        eligible = None
+        if price_cap > 0:
+            prices = load_player_prices()
+            eligible = (names.map(prices) <= price_cap * 10000000).to_numpy()
+
+        similar = sim_index.most_similar(sim_key, k=sim_k, metric=sim_metric.lower(), eligible=eligible)
+        table = pd.DataFrame({'Player': similar['name']})
+        if 'season' in similar: table['Season'] = similar['season']
+        if sim_metric == "Cosine":
+            table['Similarity'] = similar['similarity'].round(3)
+        else:
+            table['Distance'] = (-similar['similarity']).round(3)
+        table['Runs'] = similar['runs_scored'].astype(int)
+        table['Strike Rate'] = similar['batting_sr'].round(1)
+        table['Wickets'] = similar['wickets'].astype(int)
+        table['Economy'] = similar['bowling_economy'].round(2)
+        if price_cap > 0:
+            table['Last Price'] = similar['name'].map(prices).map(format_price)
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        lap.mark('similar_players', metric=sim_metric.lower(), rows=len(table))
+    lap.done()
+
 
 elif view_mode == "🏆 Hall of Fame":
     
-    if season_df is None:
+    lap = profiling.Lap('render:hall_of_fame')
+    boards = load_leaderboards(**data_slice)
+    if boards is None:
         st.error("Missing `season_data.csv`")
         st.stop()
 
+    import plotly.express as px
+    figures = load_figure_cache()
+    lap.mark('load')
+
     st.title("🏆 IPL Hall of Fame")
-    htab1, htab2, htab3 = st.tabs(["🏏 Top Batters", "🎯 Top Bowlers", "🔥 MVPs"])
+    sc1, sc2 = st.columns([1, 2])
+    with sc1: scope = st.radio("Scope", ["All-time", "Single Season", "Season Range"], horizontal=True)
+    with sc2:
+        if scope == "Single Season":
+            first = last = st.selectbox("Season", boards.seasons[::-1])
+        elif scope == "Season Range" and len(boards.seasons) > 1:
+            first, last = st.select_slider("Seasons", options=boards.seasons, value=(boards.seasons[0], boards.seasons[-1]))
+        else:
+            first = last = None
+
+    # Boards are per data slice and season span; the figures follow them
+    fig_key = (data_version(boards), first, last)
+
+    htab1, htab2, htab3, htab4, htab5 = st.tabs(["🏏 Top Batters", "🎯 Top Bowlers", "🔥 MVPs", "⚡ Strike Rate", "🧊 Economy"])
     
     with htab1:
-        top_runs = career_df.sort_values('runs_scored', ascending=False).head(10)
-        fig = px.bar(top_runs, x='runs_scored', y='name', orientation='h', color='batting_sr', color_continuous_scale='OrRd', title="Highest Run Scorers")
-        fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', yaxis={'categoryorder':'total ascending'}, height=700)
-        st.plotly_chart(fig, use_container_width=True)
+        def top_batters_chart():
+            top_runs = boards.top('runs_scored', first, last).head(10)
+            fig = px.bar(top_runs, x='runs_scored', y='name', orientation='h', color='batting_sr', color_continuous_scale='OrRd', title="Highest Run Scorers")
+            fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', yaxis={'categoryorder':'total ascending'}, height=700)
+            return fig
+        st.plotly_chart(figures.get(('hof:runs', *fig_key), top_batters_chart), use_container_width=True)
         
+        lap.mark('top_batters')
+
     with htab2:
-        top_wkts = career_df.sort_values('wickets', ascending=False).head(10)
-        fig = px.bar(top_wkts, x='wickets', y='name', orientation='h', color='bowling_economy', color_continuous_scale='Tealgrn_r', title="Highest Wicket Takers")
-        fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', yaxis={'categoryorder':'total ascending'}, height=700)
-        st.plotly_chart(fig, use_container_width=True)
+        def top_bowlers_chart():
+            top_wkts = boards.top('wickets', first, last).head(10)
+            fig = px.bar(top_wkts, x='wickets', y='name', orientation='h', color='bowling_economy', color_continuous_scale='Tealgrn_r', title="Highest Wicket Takers")
+            fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', yaxis={'categoryorder':'total ascending'}, height=700)
+            return fig
+        st.plotly_chart(figures.get(('hof:wickets', *fig_key), top_bowlers_chart), use_container_width=True)
         
+        lap.mark('top_bowlers')
+
     with htab3:
-        top_ar = career_df.sort_values('all_rounder_score', ascending=False).head(15)
-        fig = px.scatter(top_ar, x='runs_scored', y='wickets', size='all_rounder_score', color='name', title="The Elite Club (Batting vs Bowling Impact)")
-        fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', height=700)
-        st.plotly_chart(fig, use_container_width=True)
+        def mvp_chart():
+            top_ar = boards.top('all_rounder_score', first, last).head(15)
+            fig = px.scatter(top_ar, x='runs_scored', y='wickets', size='all_rounder_score', color='name', title="The Elite Club (Batting vs Bowling Impact)")
+            fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', height=700)
+            return fig
+        st.plotly_chart(figures.get(('hof:mvps', *fig_key), mvp_chart), use_container_width=True)
+        lap.mark('mvps')
+
+    with htab4:
+        min_balls = st.slider("Minimum balls faced", 10, 1000, 100, step=10)
+        def strike_rate_chart():
+            top_sr = boards.top('batting_sr', first, last, minimum=min_balls).head(10)
+            fig = px.bar(top_sr, x='batting_sr', y='name', orientation='h', color='runs_scored', color_continuous_scale='OrRd', title=f"Highest Strike Rates (min {min_balls} balls)")
+            fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', yaxis={'categoryorder':'total ascending'}, height=700)
+            return fig
+        st.plotly_chart(figures.get(('hof:strike_rate', *fig_key, min_balls), strike_rate_chart), use_container_width=True)
+        lap.mark('strike_rate')
+
+    with htab5:
+        min_overs = st.slider("Minimum overs bowled", 5, 200, 20, step=5)
+        def economy_chart():
+            top_econ = boards.top('bowling_economy', first, last, minimum=min_overs * 6).head(10)
+            fig = px.bar(top_econ, x='bowling_economy', y='name', orientation='h', color='wickets', color_continuous_scale='Tealgrn', title=f"Best Economy Rates (min {min_overs} overs)")
+            fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', yaxis={'categoryorder':'total descending'}, height=700)
+            return fig
+        st.plotly_chart(figures.get(('hof:economy', *fig_key, min_overs), economy_chart), use_container_width=True)
+        lap.mark('economy')
+    lap.done()
+
 
 elif view_mode == "🤖 ML Valuation Engine":
     
-    if df_stats is None or df_master is None:
+    lap = profiling.Lap('render:ml_valuation')
+    auction_store = load_auction_store()
+    if auction_store is None:
         st.error("⚠️ Missing Uploaded Data: `cricket_data copy.csv` or `IPL_Master_Player_Data copy.csv`")
         st.stop()
 
@@ -376,26 +485,65 @@ elif view_mode == "🤖 ML Valuation Engine":
     st.markdown("Predict a player's auction value based on performance metrics.")
     
     st.subheader("1. Select Base Profile")
-    ml_players = sorted(df_stats['Player_Name'].unique())
-    val_player = st.selectbox("Search Player Database", ["Custom Profile"] + list(ml_players))
+    val_player = st.selectbox("Search Player Database", ["Custom Profile"] + auction_store.names)
     
     d_runs, d_wkts, d_match = 400, 10, 14
     last_known_price = 0
     price_lbl = "N/A"
 
     if val_player != "Custom Profile":
-        p_stats = df_stats[df_stats['Player_Name'] == val_player].sort_values('Year')
+        p_stats = auction_store.stat_rows(val_player)
         if not p_stats.empty:
             latest = p_stats.iloc[-1]
             d_runs = int(latest['Runs_Scored'])
             d_wkts = int(latest['Wickets_Taken'])
             d_match = int(latest['Matches_Batted'])
         
-        m_entry = df_master[df_master['join_name'] == val_player.lower().strip()]
+        m_entry = auction_store.auction_rows(val_player)
         if not m_entry.empty:
-            last_known_price = m_entry.sort_values('Year').iloc[-1]['Price']
+            last_known_price = m_entry.iloc[-1]['Price']
             price_lbl = format_price(last_known_price)
 
+    lap.mark('lookup')
+
+    # Optional: replace last season's totals with a projection from recent
+    # ball-by-ball form (per-match rate x matches)
+    form_index = load_form_index() if val_player != "Custom Profile" else None
+    form_name = None
+    if form_index is not None:
+        form_name = load_cricsheet_names().get(auction_store.player_keys.get(val_player))
+        if form_name not in form_index: form_name = None
+    if form_name is not None:
+        fc1, fc2, fc3 = st.columns([1, 1, 2])
+        with fc1: use_form = st.toggle("Project from recent form")
+        # Players who only bowled have no innings to window over
+        windows = ["Last 5 matches", "Last 10 matches", "Last 10 innings", "Decayed (half-life 90 days)"]
+        if form_index.last_innings(form_name, 1) is None: windows.remove("Last 10 innings")
+        with fc2: form_basis = st.selectbox("Form window", windows, disabled=not use_form)
+        if use_form:
+            projection = None
+            if form_basis.startswith("Decayed"):
+                rates = form_index.decayed(form_name, 90)
+                if rates is not None:
+                    projection = rates['runs'], rates['wickets'], "decayed by match date, 90-day half-life"
+            else:
+                n = int(form_basis.split()[1])
+                bowl = form_index.last_matches(form_name, n)
+                f = form_index.last_innings(form_name, n) if form_basis.endswith("innings") else bowl
+                if f is not None and bowl is not None and f['matches'] and bowl['matches']:
+                    projection = (f['runs'] / f['matches'], bowl['wickets'] / bowl['matches'],
+                                  f"last {f['matches']} {'innings' if form_basis.endswith('innings') else 'matches'}")
+            if projection is None:
+                with fc3: st.caption(f"No recent form for **{form_name}** in this window; using last season's totals.")
+            else:
+                runs_rate, wkts_rate, basis_lbl = projection
+                # A partial latest season shouldn't shrink the projection
+                d_match = max(d_match, 14)
+                d_runs = min(int(round(runs_rate * d_match)), 1000)
+                d_wkts = min(int(round(wkts_rate * d_match)), 50)
+                with fc3: st.caption(f"**{form_name}**: {runs_rate:.1f} runs and {wkts_rate:.2f} wickets per match ({basis_lbl}), projected over {d_match} matches")
+        lap.mark('form')
+
     st.subheader("2. Configure Performance (What-If Analysis)")
     with st.container():
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
@@ -406,6 +554,7 @@ elif view_mode == "🤖 ML Valuation Engine":
         st.markdown('</div>', unsafe_allow_html=True)
 
     final_val, role, perf_score = calculate_valuation(i_runs, i_wkts, i_matches, last_price=last_known_price)
+    lap.mark('valuation')
     
     st.markdown("---")
     col_res1, col_res2, col_res3 = st.columns(3)
@@ -446,4 +595,257 @@ elif view_mode == "🤖 ML Valuation Engine":
                 <div class='stat-value' style='color: #fbbf24;'>{price_lbl}</div>
                 <div class='stat-label' style='margin-top: 12px;'>Market Reference</div>
             </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        """, unsafe_allow_html=True)
+    lap.mark('results')
+
+    st.markdown("---")
+    if st.toggle("🎲 Simulate price range", help="Samples plausible seasons around these inputs, shaped by the player's past seasons"):
+        import plotly.graph_objects as go
+        sims = simulate_prices(val_player, i_runs, i_wkts, i_matches, float(last_known_price))
+        bands = valuation_bands(sims['price'])
+
+        b1, b2, b3 = st.columns(3)
+        with b1: render_metric_card("Median Valuation", format_price(bands[50]), "🎯")
+        with b2: render_metric_card("Likely Range (P25–P75)", f"{format_price(bands[25])} – {format_price(bands[75])}", "📊")
+        with b3: render_metric_card("Wide Range (P5–P95)", f"{format_price(bands[5])} – {format_price(bands[95])}", "📏")
+
+        fig = go.Figure(go.Histogram(x=sims['price'] / 10000000, nbinsx=60, marker_color='#58a6ff', opacity=0.8))
+        for pct, colour in [(5, '#e74c3c'), (25, '#f39c12'), (50, '#2ecc71'), (75, '#f39c12'), (95, '#e74c3c')]:
+            fig.add_vline(x=bands[pct] / 10000000, line_dash='dash', line_color=colour, annotation_text=f"P{pct}")
+        fig.update_layout(title=f"Valuation across {len(sims):,} simulated seasons", xaxis_title="Price (₹ Cr)", yaxis_title="Seasons",
+                          template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=450, showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("Role mix: " + ", ".join(f"{r} {c / len(sims):.0%}" for r, c in sims['role'].value_counts().items()))
+        lap.mark('simulation', samples=len(sims))
+    lap.done()
+
+
+elif view_mode == "📋 League Valuations":
+
+    lap = profiling.Lap('render:league_valuations')
+    league_vals = load_league_valuations()
+    if league_vals is None:
+        st.error("⚠️ Missing Uploaded Data: `cricket_data copy.csv` or `IPL_Master_Player_Data copy.csv`")
+        st.stop()
+
+    st.title("📋 League Valuations")
+    st.markdown("Every player-season in the stats database, priced with the valuation engine.")
+
+    seasons = sorted(league_vals['Year'].dropna().astype(int).unique(), reverse=True)
+    f1, f2, f3, f4 = st.columns(4)
+    with f1: sel_seasons = st.multiselect("Season", seasons, default=seasons[:1])
+    with f2: sel_roles = st.multiselect("Role", ["Batter", "Bowler", "All-Rounder"], default=["Batter", "Bowler", "All-Rounder"])
+    with f3: min_score = st.slider("Min Performance Score", 0, 120, 0)
+    with f4: name_query = st.text_input("Player contains")
+
+    s1, s2 = st.columns([3, 1])
+    sort_options = {"Valuation": "price", "Performance Score": "perf_score", "Last Price": "last_price",
+                    "Runs": "Runs_Scored", "Wickets": "Wickets_Taken", "Season": "Year", "Player": "Player_Name"}
+    with s1: sort_label = st.selectbox("Sort by", list(sort_options))
+    with s2: ascending = st.toggle("Ascending", value=False)
+
+    lap.mark('filters')
+    mask = league_vals['role'].isin(sel_roles) & (league_vals['perf_score'] >= min_score)
+    if sel_seasons:
+        mask &= league_vals['Year'].isin(sel_seasons)
+    if name_query:
+        mask &= league_vals['Player_Name'].str.contains(name_query, case=False, regex=False, na=False)
+    table = league_vals[mask].sort_values(sort_options[sort_label], ascending=ascending, kind='stable')
+
+    c1, c2, c3 = st.columns(3)
+    with c1: render_metric_card("Players", f"{len(table):,}", "👥")
+    with c2: render_metric_card("Total Valuation", format_price(table['price'].sum()), "💰")
+    with c3: render_metric_card("Median Valuation", format_price(table['price'].median()) if len(table) else "N/A", "📊")
+
+    display = pd.DataFrame({
+        'Player': table['Player_Name'],
+        'Season': table['Year'].astype(int),
+        'Role': table['role'],
+        'Runs': table['Runs_Scored'].astype(int),
+        'Wickets': table['Wickets_Taken'].astype(int),
+        'Matches': table['Matches_Batted'].astype(int),
+        'Performance Score': table['perf_score'].round(1),
+        'Last Price': table['last_price'].map(lambda p: format_price(p) if p > 0 else "N/A"),
+        'Valuation': table['price'].map(format_price),
+    })
+    st.dataframe(display, hide_index=True, use_container_width=True, height=700)
+    lap.mark('table', rows=len(display))
+    lap.done()
+
+elif view_mode == "⚔️ Head-to-Head":
+
+    lap = profiling.Lap('render:head_to_head')
+    matchups = load_matchup_store()
+    if matchups is None:
+        st.error(f"Missing `{MATCHUPS_PATH}` (written by `python generate.py`)")
+        st.stop()
+
+    st.title("⚔️ Head-to-Head")
+    h1, h2 = st.columns([1, 2])
+    with h1: h2h_mode = st.radio("Show", ["Batter vs Bowler", "Best & Worst Matchups"], horizontal=True)
+    with h2: h2h_seasons = st.multiselect("Seasons (all if empty)", matchups.seasons[::-1])
+    lap.mark('load')
+
+    if h2h_mode == "Batter vs Bowler":
+        p1, p2 = st.columns(2)
+        with p1: batter = st.selectbox("Batter", matchups.batters)
+        faced = matchups.opponents(batter, 'batter', h2h_seasons)
+        with p2: bowler = st.selectbox("Bowler", sorted(faced['bowler']))
+        if bowler is None:
+            st.info("No deliveries for this batter in the selected seasons.")
+            st.stop()
+
+        pair = matchups.pair(batter, bowler, h2h_seasons)
+        total = faced[faced['bowler'] == bowler].iloc[0]
+        c1, c2, c3, c4, c5 = st.columns(5)
+        with c1: render_metric_card("Balls", f"{int(total['balls'])}", "⚾")
+        with c2: render_metric_card("Runs", f"{int(total['runs'])}", "🏃")
+        with c3: render_metric_card("Strike Rate", f"{total['strike_rate']:.1f}", "⚡")
+        with c4: render_metric_card("Dismissals", f"{int(total['dismissals'])}", "🎯")
+        with c5: render_metric_card("Dot Ball %", f"{total['dot_pct']:.1f}", "⏺️")
+
+        st.dataframe(pd.DataFrame({
+            'Season': pair['season'].astype(str), 'Balls': pair['balls'], 'Runs': pair['runs'],
+            'Strike Rate': pair['strike_rate'], 'Dismissals': pair['dismissals'],
+            'Dots': pair['dots'], 'Boundaries': pair['boundaries'],
+        }), hide_index=True, use_container_width=True)
+        lap.mark('pair')
+
+    else:
+        p1, p2, p3 = st.columns([2, 1, 1])
+        with p2: role = st.radio("As", ["Batter", "Bowler"], horizontal=True)
+        with p1: player = st.selectbox("Player", matchups.batters if role == "Batter" else matchups.bowlers)
+        with p3: min_balls = st.slider("Minimum balls", 1, 120, 12)
+
+        table = matchups.opponents(player, role.lower(), h2h_seasons, min_balls)
+        other = 'bowler' if role == "Batter" else 'batter'
+        # Good for a batter means a high strike rate; for a bowler, a low one
+        ranked = table.sort_values(['strike_rate', 'balls'], ascending=[role == "Bowler", False], kind='stable')
+        cols = {other: other.title(), 'balls': 'Balls', 'runs': 'Runs', 'strike_rate': 'Strike Rate',
+                'dismissals': 'Dismissals', 'average': 'Average', 'dot_pct': 'Dot %', 'boundaries': 'Boundaries'}
+
+        b1, b2 = st.columns(2)
+        with b1:
+            st.markdown("#### ✅ Best Matchups")
+            st.dataframe(ranked.head(10)[list(cols)].rename(columns=cols), hide_index=True, use_container_width=True)
+        with b2:
+            st.markdown("#### ❌ Worst Matchups")
+            st.dataframe(ranked.tail(10).iloc[::-1][list(cols)].rename(columns=cols), hide_index=True, use_container_width=True)
+        lap.mark('matchups', rows=len(table))
+    lap.done()
+
+elif view_mode == "🧮 Squad Optimizer":
+
+    lap = profiling.Lap('render:squad_optimizer')
+    league_vals = load_league_valuations()
+    if league_vals is None:
+        st.error("⚠️ Missing Uploaded Data: `cricket_data copy.csv` or `IPL_Master_Player_Data copy.csv`")
+        st.stop()
+
+    st.title("🧮 Squad Optimizer")
+    st.markdown("The highest-scoring squad the purse can buy, with every player priced by the valuation engine.")
+
+    seasons = sorted(league_vals['Year'].dropna().astype(int).unique(), reverse=True)
+    o1, o2, o3, o4 = st.columns(4)
+    with o1: pool_season = st.selectbox("Player pool (season)", seasons)
+    with o2: purse_cr = st.number_input("Purse (₹ Cr)", 10.0, 300.0, DEFAULT_PURSE / 10000000, step=5.0)
+    with o3: squad_size = st.number_input("Squad size", 1, 30, DEFAULT_SQUAD_SIZE)
+    with o4: overseas_cap = st.number_input("Max overseas", 0, 30, DEFAULT_OVERSEAS_CAP)
+
+    pool = league_vals[league_vals['Year'] == pool_season]
+    role_counts = pool['role'].value_counts()
+    minimums = {}
+    for col, role in zip(st.columns(len(ROLES)), ROLES):
+        with col:
+            minimums[role] = st.number_input(f"Min {role}s", 0, 30, int(min(DEFAULT_ROLE_MINIMUMS[role], role_counts.get(role, 0))))
+    # The data has no nationality field, so overseas players are marked by hand
+    overseas = st.multiselect("Overseas players", sorted(pool['Player_Name'].unique()))
+
+    # Live auction state lives in the session; changing any setting starts over
+    settings = (pool_season, purse_cr, squad_size, overseas_cap, tuple(minimums.items()), tuple(overseas))
+    if st.session_state.get('squad_settings') != settings:
+        candidates = pd.DataFrame({'name': pool['Player_Name'], 'role': pool['role'], 'price': pool['price'],
+                                   'perf_score': pool['perf_score'], 'overseas': pool['Player_Name'].isin(overseas)})
+        optimizer = SquadOptimizer(candidates, purse=purse_cr * 10000000, squad_size=int(squad_size),
+                                   role_minimums=minimums, overseas_cap=int(overseas_cap))
+        st.session_state.squad_settings = settings
+        st.session_state.squad_optimizer = optimizer
+        st.session_state.squad_result = optimizer.solve()
+    optimizer = st.session_state.squad_optimizer
+    lap.mark('solve')
+
+    st.markdown("#### 🔨 Live Auction")
+    st.caption("Record each sale as it happens; the squad is re-optimised from the current plan.")
+    a1, a2, a3, a4 = st.columns([2, 1, 1, 1])
+    open_players = optimizer.pool.loc[optimizer.available, 'name'].tolist()
+    with a1: sold = st.selectbox("Player sold", open_players)
+    sold_row = optimizer.pool[optimizer.pool['name'] == sold]
+    with a2: sold_price = st.number_input("Sold for (₹ Cr)", 0.0, 50.0,
+                                          round(float(sold_row['price'].iloc[0]) / 10000000, 2) if len(sold_row) else 0.0,
+                                          step=0.25, key=f"sold_price_{sold}")
+    with a3: to_us = st.toggle("Bought by us")
+    with a4:
+        if st.button("Record sale", disabled=sold is None):
+            st.session_state.squad_result = optimizer.record_sale(sold, sold_price * 10000000, to_us)
+            st.rerun()
+        if st.button("Reset auction"):
+            del st.session_state['squad_settings']
+            st.rerun()
+
+    result = st.session_state.squad_result
+    if not result['feasible']:
+        st.warning("No squad meets these constraints — loosen the role minimums, squad size or purse.")
+        st.stop()
+
+    squad = result['squad']
+    c1, c2, c3, c4 = st.columns(4)
+    with c1: render_metric_card("Squad Score", f"{result['total_score']:.1f}", "🏏")
+    with c2: render_metric_card("Squad Cost", format_price(result['total_price']), "💰")
+    with c3: render_metric_card("Purse Left", format_price(optimizer.purse - result['total_price']), "👛")
+    with c4: render_metric_card("Solve Time", f"{result['seconds'] * 1000:.0f} ms", "⏱️")
+    if not result['optimal']:
+        st.caption("Time limit reached: showing the best squad found so far.")
+
+    st.dataframe(pd.DataFrame({
+        'Player': squad['name'],
+        'Status': squad['status'],
+        'Role': squad['role'],
+        'Overseas': squad['overseas'].map({True: "✈️", False: ""}),
+        'Performance Score': squad['perf_score'].round(1),
+        'Price': squad['price'].map(format_price),
+    }), hide_index=True, use_container_width=True, height=min(38 * (len(squad) + 1), 700))
+    lap.mark('squad', rows=len(squad), nodes=result['nodes'])
+
+    if optimizer.sales:
+        with st.expander(f"Sales recorded ({len(optimizer.sales)})"):
+            sales = pd.DataFrame(optimizer.sales)
+            st.dataframe(pd.DataFrame({'Player': sales['name'], 'Price': sales['price'].map(format_price),
+                                       'Buyer': sales['to_us'].map({True: "Us", False: "Other team"})}),
+                         hide_index=True, use_container_width=True)
+    lap.done()
+
+if show_perf:
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        run = pd.DataFrame(profiling.run_stages())
+        if not run.empty:
+            st.caption("This rerun")
+            st.dataframe(run[['stage', 'seconds']].assign(ms=(run['seconds'] * 1000).round(1)).drop(columns='seconds'),
+                         hide_index=True, use_container_width=True)
+        cache = profiling.cache_stats()
+        fig_stats = load_figure_cache().stats()
+        if fig_stats['hits'] + fig_stats['misses']:
+            cache['figures'] = (fig_stats['hits'] + fig_stats['misses'], fig_stats['hits'], fig_stats['misses'])
+        if cache:
+            st.caption("Cache (this server process)")
+            st.dataframe(pd.DataFrame([(k, *v) for k, v in cache.items()], columns=['function', 'calls', 'hits', 'misses']),
+                         hide_index=True, use_container_width=True)
+        if fig_stats['hits'] + fig_stats['misses']:
+            st.caption(f"Figure cache: {fig_stats['hit_rate']:.0%} hit rate · {fig_stats['entries']} figures · "
+                       f"{fig_stats['bytes'] / 1048576:.1f} MiB of JSON · {fig_stats['evictions']} evicted")
+        if profiling.PERF_LOG_PATH:
+            st.caption(f"Full log: `{profiling.PERF_LOG_PATH}`")
+
+# Cache hits/misses (Streamlit caches and figures) go to the log once per
+# rerun too, not just to the panel
+if profiling.PERF_LOG_PATH:
+    profiling.log_counters('app:counters')
@@ -0,0 +1,147 @@
+import os
+import json
+import argparse
+import tempfile
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:     # Windows: single local process, nothing to lock against
+    fcntl = None
+import pyarrow.feather as feather
+from loaders import (build_dashboard_frames, build_ml_frames, build_identity_frames, SEASON_CSV_PATH,
+                     MASTER_CSV_PATH, AUCTION_CSV_PATH, STATS_CSV_PATH)
+from identity import PEOPLE_CSV_PATH, file_hash
+from profiling import stage
+
+# Prebuilt binary copies of the app's frames. Each group is rebuilt when one
+# of its source CSVs' hashes changes, or when ARTIFACT_BUILD_VERSION does;
+# otherwise the frames are read back from uncompressed Feather files, which
+# skips decompression. The frames are plain pandas, so every process holds
+# its own copy.
+#   python artifacts.py            # build anything stale
+#   python artifacts.py --force    # rebuild everything
+
+ARTIFACT_DIR = 'artifacts'
+ARTIFACT_MANIFEST_PATH = os.path.join(ARTIFACT_DIR, 'manifest.json')
+ARTIFACT_LOCK_PATH = os.path.join(ARTIFACT_DIR, 'manifest.lock')
+# Bump whenever the loaders' output changes (columns, dtypes, de-duplication),
+# so existing artifacts/ directories are rebuilt instead of served stale
+# 2: duplicate (name, season) and career rows dropped by the loaders
+ARTIFACT_BUILD_VERSION = 2
+
+FRAME_GROUPS = {
+    'dashboard': {
+        'build': build_dashboard_frames,
+        'sources': [SEASON_CSV_PATH, MASTER_CSV_PATH],
+        'frames': ['season_df', 'career_df'],
+    },
+    'ml': {
+        'build': build_ml_frames,
+        # people.csv and season_data.csv feed the identity resolution
+        'sources': [AUCTION_CSV_PATH, STATS_CSV_PATH, PEOPLE_CSV_PATH, SEASON_CSV_PATH],
+        'frames': ['df_master', 'df_stats'],
+    },
+    'identity': {
+        'build': build_identity_frames,
+        'sources': [SEASON_CSV_PATH],
+        'frames': ['player_identity'],
+    },
+}
+
+def artifact_path(frame):
+    return os.path.join(ARTIFACT_DIR, f'{frame}.feather')
+
+def read_manifest():
+    try:
+        with open(ARTIFACT_MANIFEST_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def replace_atomically(path, write):
+    # write(tmp) into a temp file of our own, then rename over path: readers
+    # never see a half-written file, and concurrent writers (app replicas
+    # starting together) each rename a complete file instead of racing on one
+    # shared .tmp name
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+@contextmanager
+def manifest_lock():
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    with open(ARTIFACT_LOCK_PATH, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+def write_manifest(manifest):
+    def write(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    replace_atomically(ARTIFACT_MANIFEST_PATH, write)
+
+def update_manifest(group, entry):
+    # Load/merge/write under the lock, so replicas building different groups
+    # don't drop each other's entries
+    with manifest_lock():
+        manifest = read_manifest()
+        manifest[group] = entry
+        write_manifest(manifest)
+
+def manifest_entry(hashes):
+    return {'build_version': ARTIFACT_BUILD_VERSION, 'sources': hashes}
+
+def is_fresh(group, hashes, manifest=None):
+    manifest = read_manifest() if manifest is None else manifest
+    return (manifest.get(group) == manifest_entry(hashes)
+            and all(os.path.exists(artifact_path(f)) for f in FRAME_GROUPS[group]['frames']))
+
+def build_group(group, hashes):
+    spec = FRAME_GROUPS[group]
+    frames = spec['build']()
+    if frames[0] is None:
+        return frames
+
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    for name, df in zip(spec['frames'], frames):
+        replace_atomically(artifact_path(name), lambda tmp: feather.write_feather(
+            df.reset_index(drop=True), tmp, compression='uncompressed'))
+
+    update_manifest(group, manifest_entry(hashes))
+    return frames
+
+def load_frames(group, rebuild=False):
+    spec = FRAME_GROUPS[group]
+    hashes = {src: file_hash(src) for src in spec['sources']}
+
+    if rebuild or not is_fresh(group, hashes):
+        with stage(f'artifacts:build:{group}'):
+            return build_group(group, hashes)
+
+    with stage(f'artifacts:read:{group}'):
+        return tuple(
+            feather.read_feather(artifact_path(name)) for name in spec['frames']
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the app's prebuilt data artifacts.")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the source hashes match")
+    args = parser.parse_args()
+
+    for group, spec in FRAME_GROUPS.items():
+        hashes = {src: file_hash(src) for src in spec['sources']}
+        if not args.force and is_fresh(group, hashes):
+            print(f"{group}: up to date")
+            continue
+        frames = build_group(group, hashes)
+        if frames[0] is None:
+            print(f"{group}: skipped, missing {', '.join(s for s, h in hashes.items() if h is None)}")
+        else:
+            print(f"{group}: built {', '.join(artifact_path(f) for f in spec['frames'])}")
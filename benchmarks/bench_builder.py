@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import json
+import zipfile
+import argparse
+import tracemalloc
+
+# Throughput and memory of DeliveryTableBuilder on its own: matches are
+# decoded up front so only add_match()/to_tables() are timed, and
+# tracemalloc reports what the builder holds on to.
+#   python benchmarks/bench_builder.py --matches 2000
+#   python benchmarks/bench_builder.py --zip Archive.zip
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from deliveries import DeliveryTableBuilder
+
+
+def load_matches(args):
+    if args.zip:
+        with zipfile.ZipFile(args.zip) as z:
+            members = [m for m in z.namelist() if m.endswith('.json')][:args.matches]
+            return [(m, json.loads(z.read(m))) for m in members]
+    from synth_cricsheet import MatchFactory
+    factory = MatchFactory(players=args.players)
+    return [(f"{1000000 + i}.json", factory.match(i)) for i in range(args.matches)]
+
+
+def build(matches):
+    builder = DeliveryTableBuilder()
+    for member, match_data in matches:
+        builder.add_match(member, match_data)
+    return builder
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--matches', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=600)
+    parser.add_argument('--zip', help="Read matches from a Cricsheet archive instead of synthesising them")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    matches = load_matches(args)
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        build(matches)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    builder = build(matches)
+    held, peak_build = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    tables = builder.to_tables()
+    _, peak_export = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    n = len(tables['deliveries'])
+    print(f"matches={len(matches):,}  deliveries={n:,}")
+    print(f"add_match      {best:8.3f} s  {n / best:>12,.0f} deliveries/s")
+    print(f"builder held   {held / 2**20:8.1f} MiB  ({held / n:6.1f} bytes/delivery)")
+    print(f"peak (build)   {peak_build / 2**20:8.1f} MiB")
+    print(f"peak (export)  {peak_export / 2**20:8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+
+# Scaling benchmark for the data pipeline: generate.process_season_stats on a
+# synthetic archive, then the app's dashboard and ML loaders.
+#   python benchmarks/bench_ingest.py --sizes 1000 10000 100000 --workers 4
+# Each stage runs in its own process so peak RSS is per stage. Results go to
+# benchmarks/results/ as JSON; --compare diffs against the previous run.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux; include reaped worker processes
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / 1024, 1)
+
+
+def stage_ingest(workdir, zip_path, workers):
+    import generate
+    from deliveries import load_tables
+    generate.ZIP_FILE_PATH = zip_path
+    generate.PROFILE_CSV_PATH = os.path.join(ROOT, 'people.csv')
+    generate.OUTPUT_CSV_PATH = os.path.join(workdir, 'season_data.csv')
+    generate.MANIFEST_PATH = os.path.join(workdir, 'season_manifest.json')
+    generate.DELIVERIES_DIR = os.path.join(workdir, 'deliveries')
+    generate.ADVANCED_CSV_PATH = os.path.join(workdir, 'season_advanced.csv')
+    generate.SEASON_DATASET_DIR = os.path.join(workdir, 'season_dataset')
+    generate.MATCHUPS_PATH = os.path.join(workdir, 'matchups.parquet')
+    generate.FORM_PATH = os.path.join(workdir, 'player_form.parquet')
+
+    start = time.perf_counter()
+    generate.process_season_stats(workers=workers, full=True)
+    seconds = time.perf_counter() - start
+
+    n = len(load_tables(generate.DELIVERIES_DIR, columns={'deliveries': ['match_id']})['deliveries'])
+    return {'seconds': seconds, 'deliveries': n, 'deliveries_per_s': n / seconds}
+
+
+def stage_dashboard(workdir):
+    import loaders
+    loaders.SEASON_CSV_PATH = os.path.join(workdir, 'season_data.csv')
+    loaders.MASTER_CSV_PATH = os.path.join(ROOT, 'master_data.csv')
+
+    start = time.perf_counter()
+    season_df, career_df = loaders.build_dashboard_frames()
+    return {'seconds': time.perf_counter() - start, 'season_rows': len(season_df), 'career_rows': len(career_df)}
+
+
+def stage_ml(workdir):
+    # The ML inputs don't scale with the archive; this tracks the fixed cost,
+    # including a cold identity resolution
+    import loaders
+    import identity
+    loaders.AUCTION_CSV_PATH = os.path.join(ROOT, loaders.AUCTION_CSV_PATH)
+    loaders.STATS_CSV_PATH = os.path.join(ROOT, loaders.STATS_CSV_PATH)
+    loaders.SEASON_CSV_PATH = os.path.join(workdir, 'season_data.csv')
+    identity.PEOPLE_CSV_PATH = os.path.join(ROOT, 'people.csv')
+    os.chdir(workdir)
+    if os.path.exists(identity.IDENTITY_MAP_PATH):
+        os.remove(identity.IDENTITY_MAP_PATH)
+
+    start = time.perf_counter()
+    df_master, df_stats = loaders.build_ml_frames()
+    return {'seconds': time.perf_counter() - start, 'auction_rows': len(df_master), 'stats_rows': len(df_stats)}
+
+
+def run_stage(stage, *args):
+    out = subprocess.run([sys.executable, __file__, '--stage', stage, *map(str, args)],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"stage {stage} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(current, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    before = {(r['matches'], r['stage']): r for r in previous['results']}
+    print(f"\nvs {os.path.basename(previous_path)} ({previous['revision']}):")
+    for r in current['results']:
+        old = before.get((r['matches'], r['stage']))
+        if old:
+            change = r['seconds'] / old['seconds'] - 1
+            flag = '  <-- slower' if change > 0.10 else ''
+            print(f"  {r['stage']:<10}{r['matches']:>8,} matches  {old['seconds']:8.2f}s -> {r['seconds']:8.2f}s "
+                  f"({change:+.0%}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--players', type=int, default=600)
+    parser.add_argument('--compare', action='store_true', help="Diff against the latest saved result")
+    parser.add_argument('--keep', help="Keep generated archives in this directory instead of a temp dir")
+    parser.add_argument('--stage', help=argparse.SUPPRESS)
+    args, rest = parser.parse_known_args()
+
+    if args.stage:
+        stages = {'ingest': stage_ingest, 'dashboard': stage_dashboard, 'ml': stage_ml}
+        if args.stage == 'ingest':
+            result = stage_ingest(rest[0], rest[1], int(rest[2]))
+        else:
+            result = stages[args.stage](rest[0])
+        result['peak_rss_mb'] = peak_rss_mb()
+        print(json.dumps(result))
+        return
+
+    from synth_cricsheet import write_archive
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'workers': args.workers,
+        'results': [],
+    }
+
+    base = args.keep or tempfile.mkdtemp(prefix='ipl-bench-')
+    for matches in args.sizes:
+        workdir = os.path.join(base, f'{matches}')
+        os.makedirs(workdir, exist_ok=True)
+        zip_path = os.path.join(workdir, 'Archive.zip')
+        if not os.path.exists(zip_path):
+            print(f"Generating {matches:,} synthetic matches...")
+            write_archive(zip_path, matches, players=args.players)
+
+        for stage, stage_args in [('ingest', (workdir, zip_path, args.workers)),
+                                  ('dashboard', (workdir,)), ('ml', (workdir,))]:
+            r = run_stage(stage, *stage_args)
+            r.update(stage=stage, matches=matches)
+            report['results'].append(r)
+            rate = f"  {r['deliveries_per_s']:>12,.0f} deliveries/s" if 'deliveries_per_s' in r else ''
+            print(f"{stage:<10}{matches:>8,} matches  {r['seconds']:8.2f}s  peak {r['peak_rss_mb']:>8,.1f} MiB{rate}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    previous = sorted(glob.glob(os.path.join(RESULTS_DIR, 'ingest-*.json')))
+    out_path = os.path.join(RESULTS_DIR, f"ingest-{report['timestamp'][:19].replace(':', '')}-{report['revision']}.json")
+    with open(out_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {out_path}")
+
+    if args.compare and previous:
+        compare(report, previous[-1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Row-wise apply lambdas (as load_dashboard_data used to compute them) vs the
+# vectorized versions in metrics.py, on season_data.csv tiled up to N rows.
+#   python benchmarks/bench_metrics.py --rows 500000
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from metrics import add_season_metrics, add_career_metrics
+
+
+def legacy_season_metrics(df):
+    df['batting_avg'] = df.apply(lambda x: x['runs_scored'] / (x['matches'] - x['not_outs']) if (x['matches'] - x['not_outs']) > 0 else x['runs_scored'], axis=1)
+    df['batting_sr'] = df.apply(lambda x: (x['runs_scored'] / x['balls_faced']) * 100 if x['balls_faced'] > 0 else 0, axis=1)
+    df['bowling_economy'] = df.apply(lambda x: x['runs_conceded'] / (x['balls_bowled']/6) if x['balls_bowled'] > 0 else 0, axis=1)
+    return df
+
+
+def legacy_career_metrics(df):
+    df['batting_avg'] = round(df['runs_scored'] / df['matches'], 2)
+    df['batting_sr'] = df.apply(lambda x: round((x['runs_scored'] / x['balls_faced']) * 100, 2) if x['balls_faced'] > 0 else 0, axis=1)
+    df['bowling_economy'] = df.apply(lambda x: round(x['runs_conceded'] / (x['balls_bowled']/6), 2) if x['balls_bowled'] > 0 else 0, axis=1)
+    df['all_rounder_score'] = df['runs_scored'] + (df['wickets'] * 25)
+    for col in ['batting_avg', 'batting_sr', 'runs_scored', 'wickets']:
+        max_val = df[col].quantile(0.99)
+        if max_val == 0: max_val = 1
+        df[f'norm_{col}'] = (df[col] / max_val).clip(0, 1)
+    df['norm_bowling_economy'] = 1 - ((df['bowling_economy'] - 5) / (12 - 5)).clip(0, 1)
+    return df
+
+
+def timed(fn, df, repeat):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        out = fn(frame)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def compare(label, legacy_fn, fast_fn, df, cols, repeat):
+    t_old, old = timed(legacy_fn, df, repeat)
+    t_new, new = timed(fast_fn, df, repeat)
+    for c in cols:
+        if not np.allclose(old[c].astype(float), new[c].astype(float), atol=0.011):
+            raise AssertionError(f"{label}: column {c} differs from the legacy lambdas")
+    print(f"{label:<8} rows={len(df):>9,}  apply={t_old*1000:9.1f} ms  vectorized={t_new*1000:7.1f} ms  speedup={t_old/t_new:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000, help="Season rows to benchmark on")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    base = pd.read_csv(os.path.join(ROOT, 'season_data.csv'))
+    reps = max(1, -(-args.rows // len(base)))
+    season = pd.concat([base] * reps, ignore_index=True).head(args.rows)
+
+    sum_cols = ['matches', 'runs_scored', 'balls_faced', 'wickets', 'balls_bowled', 'runs_conceded', 'catches']
+    # Give each tiled copy its own names so the career frame grows too
+    season['name'] = season['name'] + '#' + (season.index // len(base)).astype(str)
+    career = season.groupby('name')[sum_cols].sum().reset_index()
+
+    compare('season', legacy_season_metrics, add_season_metrics, season,
+            ['batting_avg', 'batting_sr', 'bowling_economy'], args.repeat)
+    compare('career', legacy_career_metrics, add_career_metrics, career,
+            ['batting_avg', 'batting_sr', 'bowling_economy', 'all_rounder_score',
+             'norm_batting_avg', 'norm_batting_sr', 'norm_runs_scored', 'norm_wickets',
+             'norm_bowling_economy'], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Time-to-first-render of app.py's default view, each sample in a fresh
+# process so module imports and st.cache_* start cold. Also reports which
+# data groups and plotting modules that first render pulled in, since the
+# default view should not touch the ML data or plotly.express.
+#   python benchmarks/bench_startup.py --runs 5
+# Exits non-zero when the median misses TARGET_FIRST_RENDER_S.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET_FIRST_RENDER_S = 1.0
+
+CHILD = r'''
+import os, sys, json, time
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+import artifacts
+loaded = []
+_load_frames = artifacts.load_frames
+def load_frames(group, *args, **kwargs):
+    loaded.append(group)
+    return _load_frames(group, *args, **kwargs)
+artifacts.load_frames = load_frames
+at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+t1 = time.perf_counter()
+at.run()
+t2 = time.perf_counter()
+print(json.dumps({
+    "harness_s": t1 - t0,
+    "first_render_s": t2 - t1,
+    "groups": loaded,
+    "plotly_express": "plotly.express" in sys.modules,
+    "exceptions": [e.value for e in at.exception],
+}))
+'''
+
+
+def sample():
+    out = subprocess.run([sys.executable, '-c', f'ROOT = {ROOT!r}\n' + CHILD],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target', type=float, default=TARGET_FIRST_RENDER_S)
+    args = parser.parse_args()
+
+    # Make sure the artifacts exist; their build time is a deploy cost, not startup
+    subprocess.run([sys.executable, 'artifacts.py'], cwd=ROOT, check=True, capture_output=True)
+
+    samples = [sample() for _ in range(args.runs)]
+    times = [s['first_render_s'] for s in samples]
+    median = statistics.median(times)
+
+    last = samples[-1]
+    print(f"first render: median {median * 1000:.0f} ms, min {min(times) * 1000:.0f} ms, "
+          f"max {max(times) * 1000:.0f} ms over {len(times)} cold runs")
+    print(f"data groups loaded: {', '.join(last['groups']) or 'none'}")
+    print(f"plotly.express imported: {last['plotly_express']}")
+    if last['exceptions']:
+        print(f"app raised: {last['exceptions']}")
+        sys.exit(1)
+
+    status = "PASS" if median <= args.target else "FAIL"
+    print(f"target {args.target * 1000:.0f} ms: {status}")
+    sys.exit(0 if status == "PASS" else 1)
+
+
+if __name__ == '__main__':
+    main()
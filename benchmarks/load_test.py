@@ -0,0 +1,388 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import subprocess
+import urllib.request
+from datetime import datetime, timezone
+
+# Concurrent-session load test for app.py. Starts a real `streamlit run`
+# server and connects simulated analysts to it over the websocket protocol
+# the browser uses. Their reruns overlap on the server's script threads and
+# share st.cache_* and the figure cache, as in production. Each analyst
+# drives Player 360, Hall of Fame and the ML Valuation Engine with random
+# players, sliders and view switches.
+#   python benchmarks/load_test.py --sessions 50 --actions 20
+#
+# Latency is the time from sending a rerun to the server's script_finished
+# message, what the browser waits for. The clients share one asyncio loop
+# here; reading each page to choose the next move happens between reruns,
+# outside the timed window.
+#
+# Reports p50/p95/p99 latency (overall and per view), the server's RSS
+# (start, after warm-up, peak and end) and cache hits/misses during the run,
+# read from the app's performance panel. --cold skips the warm-up, so all
+# sessions start on empty caches and concurrent fills of the same entry
+# show up as extra misses. Results go to benchmarks/results/ as JSON;
+# --target-p95 makes a slow run exit non-zero.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+APP_PATH = os.path.join(ROOT, 'app.py')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+VIEWS = ["👤 Player 360° Profile", "🏆 Hall of Fame", "🤖 ML Valuation Engine"]
+PERF_PANEL = "⏱️ Performance panel"
+SWITCH_VIEW_P = 0.25
+PERCENTILES = [50, 95, 99]
+SERVER_START_TIMEOUT = 60
+RSS_SAMPLE_S = 0.25
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, perf_log, log_path):
+    env = dict(os.environ, IPL_PERF_LOG=perf_log)
+    with open(log_path, 'w') as log:
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', APP_PATH, '--server.headless=true',
+             '--server.address=127.0.0.1', f'--server.port={port}', '--server.fileWatcherType=none',
+             '--browser.gatherUsageStats=false'],
+            cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.time() + SERVER_START_TIMEOUT
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f"streamlit exited with {proc.returncode}; see {log_path}")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    sys.exit(f"streamlit didn't come up within {SERVER_START_TIMEOUT}s; see {log_path}")
+
+
+def rss_mb(pid):
+    # Resident set size of the server process; None where /proc isn't there
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1 << 20)
+    except (OSError, ValueError):
+        return None
+
+
+def find(elements, label):
+    return next((w for w in elements if w.label == label), None)
+
+
+def widget_state(widget, value):
+    # The WidgetState the frontend sends once a widget has been changed
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    state = WidgetState(id=widget.id)
+    if widget.type in ('radio', 'selectbox'):
+        state.string_value = value
+    elif widget.type == 'slider':
+        state.double_array_value.data[:] = [value]
+    else:
+        state.bool_value = value
+    return state
+
+
+class Session:
+    # One browser tab: a websocket session plus the widget values the
+    # frontend would send back with every rerun
+
+    def __init__(self, sid, seed, url, timeout):
+        self.sid = sid
+        self.rng = random.Random(seed)
+        self.url = url
+        self.timeout = timeout
+        self.ws = None
+        self.tree = None
+        self.states = {}        # widget id -> WidgetState
+        self.view = VIEWS[0]
+        self.samples = []       # (view, action, latency) in seconds
+        self.errors = []
+
+    async def connect(self):
+        import websockets
+        self.ws = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _until_finished(self, messages):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            if msg.WhichOneof('type') == 'script_finished':
+                return msg.script_finished
+            messages.append(msg)
+
+    async def rerun(self, action, change=None):
+        # -> False once the session is unusable (timeout or dropped socket)
+        import websockets
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+        if change is not None:
+            widget, value = change
+            self.states[widget.id] = widget_state(widget, value)
+        back = BackMsg()
+        back.rerun_script.widget_states.widgets.extend(self.states.values())
+
+        messages = []
+        start = time.perf_counter()
+        try:
+            await self.ws.send(back.SerializeToString())
+            status = await asyncio.wait_for(self._until_finished(messages), self.timeout)
+        except (asyncio.TimeoutError, websockets.WebSocketException) as e:
+            self.errors.append(f'{self.view} / {action}: {e!r}')
+            return False
+        self.samples.append((self.view, action, time.perf_counter() - start))
+
+        if status != ForwardMsg.FINISHED_SUCCESSFULLY:
+            self.errors.append(f'{self.view} / {action}: script finished with status {status}')
+        self.tree = parse_tree_from_messages(messages)
+        self.errors.extend(f'{self.view} / {action}: {e.value}' for e in self.tree.exception)
+        return True
+
+    def _pick(self, elements, label):
+        widget = find(elements, label)
+        if widget is None or not widget.options:
+            return None
+        return widget, self.rng.choice(widget.options)
+
+    def _slide(self, label, lo, hi, step=1):
+        widget = find(self.tree.slider, label)
+        return None if widget is None else (widget, self.rng.randrange(lo, hi + 1, step))
+
+    def actions(self):
+        # Widget moves available on the current page: (name, (widget, value))
+        tree, rng = self.tree, self.rng
+        if self.view == VIEWS[0]:
+            return [('select_player', self._pick(tree.sidebar.selectbox, "🔍 Select Player")),
+                    ('similar_k', self._slide("Players", 5, 50)),
+                    ('similar_metric', self._pick(tree.radio, "Metric"))]
+        if self.view == VIEWS[1]:
+            return [('scope', self._pick(tree.radio, "Scope")),
+                    ('season', self._pick(tree.selectbox, "Season")),
+                    ('min_balls', self._slide("Minimum balls faced", 10, 1000, 10)),
+                    ('min_overs', self._slide("Minimum overs bowled", 5, 200, 5))]
+        toggle = find(tree.toggle, "🎲 Simulate price range")
+        return [('select_player', self._pick(tree.selectbox, "Search Player Database")),
+                ('runs', self._slide("Runs Scored (Season)", 0, 1000)),
+                ('wickets', self._slide("Wickets Taken (Season)", 0, 50)),
+                ('simulate', None if toggle is None else (toggle, rng.random() < 0.5))]
+
+    async def switch_view(self, view):
+        self.view = view
+        return await self.rerun('switch_view', (find(self.tree.sidebar.radio, "Navigation"), view))
+
+    async def step(self):
+        if self.rng.random() < SWITCH_VIEW_P:
+            return await self.switch_view(self.rng.choice([v for v in VIEWS if v != self.view]))
+        options = [(name, change) for name, change in self.actions() if change is not None]
+        return await self.rerun(*self.rng.choice(options)) if options else True
+
+    async def play(self, n_actions, think):
+        await self.connect()
+        if not await self.rerun('first_render'):
+            return self
+        for _ in range(n_actions):
+            if think:
+                await asyncio.sleep(self.rng.uniform(0, think))
+            if not await self.step():
+                break
+        return self
+
+
+async def cache_counters(probe, panel):
+    # {function: (calls, hits, misses)} from the performance panel's cache
+    # table, which covers the whole server process including this rerun.
+    # Widget ids are the same in every session, so the probe can switch the
+    # panel on from its first rerun and every probe rerun costs the same.
+    if probe.ws is None:
+        await probe.connect()
+    await probe.rerun('probe', (panel, True))
+    for table in probe.tree.sidebar.dataframe:
+        df = table.value
+        if 'function' in df:
+            return {r.function: (int(r.calls), int(r.hits), int(r.misses)) for r in df.itertuples()}
+    return {}
+
+
+def cache_delta(before, after, extra=None):
+    # -> {function: {calls, hits, misses}} for after - before - extra
+    out = {}
+    for name, counts in after.items():
+        b, e = before.get(name, (0, 0, 0)), (extra or {}).get(name, (0, 0, 0))
+        calls, hits, misses = (counts[i] - b[i] - e[i] for i in range(3))
+        if calls:
+            out[name] = {'calls': calls, 'hits': hits, 'misses': misses}
+    return out
+
+
+def percentiles(values):
+    import numpy as np
+    if not values:
+        return {f'p{p}': None for p in PERCENTILES}
+    return {f'p{p}': float(np.percentile(values, p)) for p in PERCENTILES}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def fmt_ms(seconds):
+    return '     -' if seconds is None else f'{seconds * 1000:6.0f}'
+
+
+async def load(args, url, server_pid):
+    rss = {'start': rss_mb(server_pid)}
+    probe = Session(-2, args.seed - 2, url, args.timeout)
+    before, panel = {}, None
+    if not args.cold:
+        # One analyst clicking through every view first, as on a real morning
+        warm = Session(-1, args.seed - 1, url, args.timeout)
+        await warm.connect()
+        await warm.rerun('first_render')
+        panel = find(warm.tree.sidebar.toggle, PERF_PANEL)
+        for view in VIEWS[1:]:
+            await warm.switch_view(view)
+        await warm.close()
+        if warm.errors:
+            print("Warm-up failed:\n  " + '\n  '.join(warm.errors))
+            sys.exit(1)
+        before = await cache_counters(probe, panel)
+    rss['after_warmup'] = rss_mb(server_pid)
+
+    print(f"Running {args.sessions} sessions x {args.actions} actions "
+          f"({args.concurrency or args.sessions} at a time) against {url}...")
+    slots = asyncio.Semaphore(args.concurrency or args.sessions)
+    sessions = [Session(sid, args.seed + sid, url, args.timeout) for sid in range(args.sessions)]
+    peak = [rss['after_warmup'] or 0.0]
+
+    async def run(session):
+        async with slots:
+            return await session.play(args.actions, args.think)
+
+    async def sample_rss():
+        while True:
+            peak[0] = max(peak[0], rss_mb(server_pid) or 0.0)
+            await asyncio.sleep(RSS_SAMPLE_S)
+
+    sampler = asyncio.create_task(sample_rss())
+    start = time.perf_counter()
+    # Sessions stay connected until the end, like open browser tabs
+    await asyncio.gather(*(run(s) for s in sessions))
+    wall = time.perf_counter() - start
+    sampler.cancel()
+    rss['peak'], rss['end'] = peak[0] or None, rss_mb(server_pid)
+
+    caches = {}
+    panel = panel or next((find(s.tree.sidebar.toggle, PERF_PANEL) for s in sessions if s.tree is not None), None)
+    if panel is not None:
+        # after counts one probe rerun more than before; the next rerun measures it
+        after = await cache_counters(probe, panel)
+        extra = cache_delta(after, await cache_counters(probe, panel))
+        caches = cache_delta(before, after, {k: (v['calls'], v['hits'], v['misses']) for k, v in extra.items()})
+    for session in sessions + [probe]:
+        await session.close()
+    return sessions, wall, rss, caches
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, help="Sessions running at once (default: all)")
+    parser.add_argument('--actions', type=int, default=20, help="Widget changes per session")
+    parser.add_argument('--think', type=float, default=0.0, help="Up to this many seconds' pause before each action")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300, help="Per-rerun timeout, seconds")
+    parser.add_argument('--cold', action='store_true', help="Skip the warm-up session, so the load starts on empty caches")
+    parser.add_argument('--target-p95', type=float, help="Exit non-zero if overall p95 latency exceeds this many seconds")
+    parser.add_argument('--perf-log', default='', help="Also write the server's stage log here")
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, 'artifacts.py'], cwd=ROOT, check=True, capture_output=True)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    port = free_port()
+    server_log = os.path.join(RESULTS_DIR, 'server.log')
+    server = start_server(port, args.perf_log, server_log)
+    try:
+        sessions, wall, rss, caches = asyncio.run(load(args, f'ws://127.0.0.1:{port}/_stcore/stream', server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+    samples = [s for session in sessions for s in session.samples]
+    errors = [e for session in sessions for e in session.errors]
+    groups = {'all reruns': samples, 'first render': [x for x in samples if x[1] == 'first_render']}
+    groups.update((view.split(' ', 1)[1], [x for x in samples if x[0] == view]) for view in VIEWS)
+    per_session = None
+    if rss['end'] is not None and rss['after_warmup'] is not None:
+        per_session = (rss['end'] - rss['after_warmup']) / max(args.sessions, 1)
+    report = {
+        'revision': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'sessions': args.sessions,
+        'concurrency': args.concurrency or args.sessions,
+        'actions': args.actions,
+        'think': args.think,
+        'seed': args.seed,
+        'cold': args.cold,
+        'reruns': len(samples),
+        'wall_seconds': wall,
+        'reruns_per_s': len(samples) / wall,
+        'latency': {name: percentiles([x[2] for x in rows]) for name, rows in groups.items()},
+        'server_rss_mb': {**rss, 'per_session': per_session},
+        'caches': caches,
+        'errors': errors[:50],
+        'error_count': len(errors),
+    }
+
+    print(f"\n{len(samples):,} reruns in {wall:.1f}s ({report['reruns_per_s']:.1f}/s)")
+    print(f"{'latency (ms)':<24}" + ''.join(f'{f"p{p}":>8}' for p in PERCENTILES))
+    for name in groups:
+        lat = report['latency'][name]
+        print(f"  {name:<22}" + ''.join(f"  {fmt_ms(lat[f'p{p}'])}" for p in PERCENTILES))
+    if per_session is not None:
+        print(f"\nServer RSS: {rss['start']:.0f} MiB at start, {rss['after_warmup']:.0f} after warm-up, "
+              f"{rss['peak']:.0f} peak, {rss['end']:.0f} at end ({per_session:+.2f} MiB per session)")
+    print("\nCache calls during the run:")
+    for name, c in sorted(caches.items()):
+        print(f"  {name:<28}{c['calls']:>7} calls  {c['hits'] / c['calls']:6.1%} hits  {c['misses']:>5} misses")
+    if errors:
+        print(f"\n{len(errors)} errors, e.g.:\n  " + '\n  '.join(errors[:5]))
+
+    out_path = os.path.join(RESULTS_DIR, f"loadtest-{report['timestamp'][:19].replace(':', '')}-{report['revision']}.json")
+    with open(out_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {out_path}")
+
+    if errors or (args.target_p95 and report['latency']['all reruns']['p95'] > args.target_p95):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+
+# Before/after memory footprint of the dashboard frames: the legacy layout
+# (every column as read from season_data.csv, int64/float64/str) vs the
+# compact schema in schema.py.
+#   python benchmarks/memory_report.py
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from loaders import build_dashboard_frames, build_identity_frames
+from schema import memory_footprint
+
+
+def fmt(n):
+    return f"{n / 1024:,.1f} KiB" if n < 1 << 20 else f"{n / (1 << 20):,.2f} MiB"
+
+
+def main():
+    legacy_season, legacy_career = build_dashboard_frames(compact=False)
+    season, career = build_dashboard_frames(compact=True)
+    identity, = build_identity_frames()
+
+    rows = [
+        ('season_df', memory_footprint(legacy_season), memory_footprint(season)),
+        ('career_df', memory_footprint(legacy_career), memory_footprint(career)),
+    ]
+    print(f"{'frame':<12}{'legacy':>14}{'compact':>14}{'saved':>9}")
+    for name, before, after in rows:
+        print(f"{name:<12}{fmt(before):>14}{fmt(after):>14}{1 - after / before:>9.0%}")
+    total_before = sum(r[1] for r in rows)
+    total_after = sum(r[2] for r in rows)
+    print(f"{'total':<12}{fmt(total_before):>14}{fmt(total_after):>14}{1 - total_after / total_before:>9.0%}")
+    print(f"\nplayer_identity (loaded on demand): {fmt(memory_footprint(identity))}, {len(identity):,} rows")
+
+
+if __name__ == '__main__':
+    main()
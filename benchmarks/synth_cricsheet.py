@@ -0,0 +1,141 @@
+import json
+import random
+import zipfile
+import argparse
+
+# Writes a zip of synthetic matches in Cricsheet's JSON layout, for
+# benchmarking generate.py and the app loaders at sizes the real archive
+# doesn't reach.
+#   python benchmarks/synth_cricsheet.py synthetic.zip --matches 10000
+
+WICKET_MIX = {
+    'caught': 0.58, 'bowled': 0.15, 'lbw': 0.09, 'run out': 0.09, 'stumped': 0.04,
+    'caught and bowled': 0.04, 'retired hurt': 0.01,
+}
+RUN_WEIGHTS = {0: 0.36, 1: 0.36, 2: 0.08, 3: 0.01, 4: 0.12, 6: 0.07}
+EXTRA_MIX = {'wides': 0.55, 'noballs': 0.15, 'legbyes': 0.2, 'byes': 0.1}
+LEAGUES = ['Indian Premier League', 'Big Bash League', 'Pakistan Super League', 'Caribbean Premier League']
+FIELDED_KINDS = {'caught', 'run out', 'stumped'}
+
+
+class MatchFactory:
+
+    def __init__(self, players=600, seasons=16, first_season=2008, leagues=1, teams=10,
+                 extras_rate=0.06, wicket_rate=0.05, wicket_mix=None, seed=0):
+        self.rng = random.Random(seed)
+        self.players = [f"{chr(65 + i % 26)}{chr(65 + (i // 26) % 26)} Player{i}" for i in range(players)]
+        self.registry = {name: f"{i:08x}" for i, name in enumerate(self.players)}
+        self.seasons = list(range(first_season, first_season + seasons))
+        self.leagues = LEAGUES[:max(1, leagues)]
+        self.teams = [f"Team {i + 1}" for i in range(teams)]
+        self.extras_rate = extras_rate
+        self.wicket_rate = wicket_rate
+        self.wicket_kinds, self.wicket_weights = zip(*(wicket_mix or WICKET_MIX).items())
+        self.runs, self.run_weights = zip(*RUN_WEIGHTS.items())
+        self.extra_kinds, self.extra_weights = zip(*EXTRA_MIX.items())
+
+    def season_label(self, year):
+        # Cricsheet writes some seasons as "2007/08"
+        return f"{year - 1}/{str(year)[2:]}" if self.rng.random() < 0.1 else str(year)
+
+    def innings(self, team, batting, bowling):
+        rng = self.rng
+        order = list(batting)
+        striker, non_striker, next_in = order[0], order[1], 2
+        bowlers = bowling[-5:]
+        overs, wickets = [], 0
+
+        for over_no in range(20):
+            bowler = bowlers[over_no % len(bowlers)]
+            deliveries, legal = [], 0
+            while legal < 6:
+                runs = rng.choices(self.runs, self.run_weights)[0]
+                ball = {'batter': striker, 'bowler': bowler, 'non_striker': non_striker,
+                        'runs': {'batter': runs, 'extras': 0, 'total': runs}}
+
+                if rng.random() < self.extras_rate:
+                    kind = rng.choices(self.extra_kinds, self.extra_weights)[0]
+                    extra = 1 if kind in ('wides', 'noballs') else rng.choice([1, 1, 2, 4])
+                    if kind in ('wides', 'legbyes', 'byes'):
+                        ball['runs']['batter'] = runs = 0
+                    ball['extras'] = {kind: extra}
+                    ball['runs']['extras'] = extra
+                    ball['runs']['total'] = runs + extra
+                    if kind not in ('wides', 'noballs'): legal += 1
+                else:
+                    legal += 1
+
+                if rng.random() < self.wicket_rate:
+                    kind = rng.choices(self.wicket_kinds, self.wicket_weights)[0]
+                    out = {'player_out': striker, 'kind': kind}
+                    if kind in FIELDED_KINDS:
+                        # bowling[0] keeps wicket
+                        out['fielders'] = [{'name': bowling[0] if kind == 'stumped' else rng.choice(bowling)}]
+                    ball['wickets'] = [out]
+                    wickets += 1
+                    if wickets == 10 or next_in >= len(order):
+                        deliveries.append(ball)
+                        overs.append({'over': over_no, 'deliveries': deliveries})
+                        return {'team': team, 'overs': overs}
+                    striker, next_in = order[next_in], next_in + 1
+
+                deliveries.append(ball)
+                if runs % 2 == 1:
+                    striker, non_striker = non_striker, striker
+
+            overs.append({'over': over_no, 'deliveries': deliveries})
+            striker, non_striker = non_striker, striker
+
+        return {'team': team, 'overs': overs}
+
+    def match(self, match_no):
+        rng = self.rng
+        year = self.seasons[match_no % len(self.seasons)]
+        home, away = rng.sample(self.teams, 2)
+        squad = rng.sample(self.players, 22)
+        xi = {home: squad[:11], away: squad[11:]}
+
+        return {
+            'meta': {'data_version': '1.1.0', 'created': f'{year}-06-01', 'revision': 1},
+            'info': {
+                'balls_per_over': 6,
+                'dates': [f"{year}-{4 + match_no % 2:02d}-{1 + match_no % 28:02d}"],
+                'event': {'name': self.leagues[(match_no // len(self.seasons)) % len(self.leagues)],
+                          'match_number': match_no + 1},
+                'gender': 'male',
+                'match_type': 'T20',
+                'overs': 20,
+                'players': xi,
+                'registry': {'people': {p: self.registry[p] for p in squad}},
+                'season': self.season_label(year),
+                'team_type': 'club',
+                'teams': [home, away],
+                'toss': {'decision': 'bat', 'winner': home},
+            },
+            'innings': [self.innings(home, xi[home], xi[away]), self.innings(away, xi[away], xi[home])],
+        }
+
+
+def write_archive(path, matches, **factory_kwargs):
+    factory = MatchFactory(**factory_kwargs)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+        for i in range(matches):
+            z.writestr(f"{1000000 + i}.json", json.dumps(factory.match(i), separators=(',', ':')))
+        z.writestr('README.txt', f"Synthetic Cricsheet archive, {matches} matches\n")
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write a synthetic Cricsheet-format match archive.")
+    parser.add_argument('path')
+    parser.add_argument('--matches', type=int, default=1000)
+    parser.add_argument('--players', type=int, default=600)
+    parser.add_argument('--seasons', type=int, default=16)
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--extras-rate', type=float, default=0.06, help="Share of deliveries with an extra")
+    parser.add_argument('--wicket-rate', type=float, default=0.05, help="Share of deliveries with a dismissal")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_archive(args.path, args.matches, players=args.players, seasons=args.seasons, leagues=args.leagues,
+                  extras_rate=args.extras_rate, wicket_rate=args.wicket_rate, seed=args.seed)
+    print(f"Wrote {args.matches} matches to {args.path}")
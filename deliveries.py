@@ -0,0 +1,372 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Ball-by-ball storage for the ingester. Every delivery from the archive is
+# kept as one integer-coded row, so season (or any other) aggregates can be
+# recomputed with array ops instead of re-parsing the match JSON.
+
+SEASON_STAT_COLUMNS = [
+    'matches', 'innings_batted', 'runs_scored', 'balls_faced', 'fours', 'sixes',
+    'not_outs', 'high_score', 'centuries', 'fifties', 'innings_bowled',
+    'balls_bowled', 'runs_conceded', 'wickets', 'catches', 'stumpings'
+]
+
+# Bowler isn't credited for these dismissals
+NON_BOWLER_WICKETS = ['run out', 'retired hurt', 'obstructing the field']
+
+DELIVERY_DTYPES = {
+    'match_id': 'int32', 'season_id': 'int16', 'innings': 'int8', 'over': 'int16', 'ball': 'int16',
+    'batter_id': 'int32', 'bowler_id': 'int32', 'non_striker_id': 'int32',
+    'runs_batter': 'int16', 'runs_extras': 'int16', 'runs_total': 'int16',
+    'wides': 'int16', 'noballs': 'int16', 'byes': 'int16', 'legbyes': 'int16', 'penalty': 'int16',
+}
+WICKET_DTYPES = {'delivery_idx': 'int32', 'kind_id': 'int8', 'player_out_id': 'int32'}
+FIELDER_DTYPES = {'delivery_idx': 'int32', 'kind_id': 'int8', 'fielder_id': 'int32'}
+
+TABLE_FILES = ['deliveries', 'wickets', 'fielders', 'players', 'seasons', 'kinds', 'matches']
+
+# Matches without an event name (and tables saved before leagues were kept)
+UNKNOWN_LEAGUE = 'Unknown'
+
+
+def clean_season(raw_season):
+    # "2007/08" -> "2007"
+    raw_season = str(raw_season)
+    return raw_season.split('/')[0] if '/' in raw_season else raw_season
+
+
+def league_name(info):
+    return (info.get('event') or {}).get('name') or UNKNOWN_LEAGUE
+
+
+class ColumnBuffer:
+    # Typed numpy columns that grow in chunks (capacity doubles when full).
+    # Rows arrive a whole match at a time as tuples in column order, so the
+    # per-ball work is one tuple append and the conversion happens in numpy.
+
+    def __init__(self, dtypes, capacity=1 << 14):
+        self.dtypes = dtypes
+        self.columns = {c: np.empty(capacity, dtype=t) for c, t in dtypes.items()}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, rows):
+        if not rows: return
+        block = np.array(rows, dtype=np.int64)
+        end = self.size + len(block)
+        capacity = len(self.columns[next(iter(self.dtypes))])
+        if end > capacity:
+            capacity = max(end, capacity * 2)
+            for c, col in self.columns.items():
+                grown = np.empty(capacity, dtype=col.dtype)
+                grown[:self.size] = col[:self.size]
+                self.columns[c] = grown
+        for j, col in enumerate(self.columns.values()):
+            col[self.size:end] = block[:, j]
+        self.size = end
+
+    def to_frame(self):
+        return pd.DataFrame({c: col[:self.size] for c, col in self.columns.items()}, copy=True)
+
+
+class DeliveryTableBuilder:
+    # Collects matches into typed column buffers; names, seasons and dismissal
+    # kinds are interned to ids in first-seen order
+
+    def __init__(self):
+        self.players = {}
+        self.seasons = {}
+        self.kinds = {}
+        self.matches = []
+        self.leagues = []
+        self.dates = []
+        self.deliveries = ColumnBuffer(DELIVERY_DTYPES)
+        self.wickets = ColumnBuffer(WICKET_DTYPES, capacity=1 << 10)
+        self.fielders = ColumnBuffer(FIELDER_DTYPES, capacity=1 << 10)
+
+    @staticmethod
+    def _intern(table, key):
+        idx = table.get(key)
+        if idx is None:
+            idx = table[key] = len(table)
+        return idx
+
+    def add_match(self, member, match_data):
+        if 'innings' not in match_data or 'info' not in match_data:
+            return False
+
+        season_id = self._intern(self.seasons, clean_season(match_data['info'].get('season', 'Unknown')))
+        match_id = len(self.matches)
+        self.matches.append(member)
+        self.leagues.append(league_name(match_data['info']))
+        self.dates.append(str((match_data['info'].get('dates') or [''])[0]))
+
+        players = self.players
+        player = lambda name: self._intern(players, name)
+        first_idx = len(self.deliveries)
+        deliveries, wickets, fielders = [], [], []
+
+        for inning_no, inning in enumerate(match_data['innings']):
+            if 'overs' not in inning: continue
+
+            for over in inning['overs']:
+                over_no = over.get('over', 0)
+                for ball_no, ball in enumerate(over['deliveries']):
+                    runs = ball['runs']
+                    extras = ball.get('extras', {})
+
+                    # Same order as DELIVERY_DTYPES
+                    deliveries.append((
+                        match_id, season_id, inning_no, over_no, ball_no,
+                        player(ball['batter']), player(ball['bowler']),
+                        player(ball.get('non_striker', ball['batter'])),
+                        runs['batter'], runs.get('extras', 0), runs['total'],
+                        extras.get('wides', 0), extras.get('noballs', 0), extras.get('byes', 0),
+                        extras.get('legbyes', 0), extras.get('penalty', 0),
+                    ))
+
+                    for wkt in ball.get('wickets', []):
+                        delivery_idx = first_idx + len(deliveries) - 1
+                        kind_id = self._intern(self.kinds, wkt['kind'])
+                        wickets.append((delivery_idx, kind_id, player(wkt['player_out'])))
+
+                        for fielder in wkt.get('fielders', []):
+                            fielders.append((delivery_idx, kind_id, player(fielder['name'])))
+
+        self.deliveries.extend(deliveries)
+        self.wickets.extend(wickets)
+        self.fielders.extend(fielders)
+        return True
+
+    def to_tables(self):
+        return {
+            'deliveries': self.deliveries.to_frame(),
+            'wickets': self.wickets.to_frame(),
+            'fielders': self.fielders.to_frame(),
+            'players': _lookup(self.players, 'name'),
+            'seasons': _lookup(self.seasons, 'season'),
+            'kinds': _lookup(self.kinds, 'kind'),
+            'matches': pd.DataFrame({'member': pd.Series(self.matches, dtype=object),
+                                     'league': pd.Series(self.leagues, dtype=object),
+                                     'date': pd.Series(self.dates, dtype=object)}),
+        }
+
+
+def _lookup(table, col):
+    return pd.DataFrame({col: pd.Series(list(table), dtype=object)})
+
+
+def empty_tables():
+    return DeliveryTableBuilder().to_tables()
+
+
+def concat_tables(parts):
+    # Merges tables built independently (e.g. one per worker shard), remapping
+    # each part's local ids onto one shared set of lookups. Parts are taken in
+    # order, so first-seen order is the same as building them in one pass.
+    lookups = {'players': {}, 'seasons': {}, 'kinds': {}}
+    lookup_col = {'players': 'name', 'seasons': 'season', 'kinds': 'kind'}
+    deliveries, wickets, fielders, matches = [], [], [], []
+    n_deliveries = n_matches = 0
+
+    for part in parts:
+        remap = {}
+        for name, table in lookups.items():
+            values = part[name][lookup_col[name]]
+            remap[name] = np.array([DeliveryTableBuilder._intern(table, v) for v in values], dtype='int64')
+
+        d = part['deliveries'].copy()
+        d['match_id'] += n_matches
+        d['season_id'] = remap['seasons'][d['season_id'].to_numpy()]
+        for c in ['batter_id', 'bowler_id', 'non_striker_id']:
+            d[c] = remap['players'][d[c].to_numpy()]
+
+        w = part['wickets'].copy()
+        w['delivery_idx'] += n_deliveries
+        w['kind_id'] = remap['kinds'][w['kind_id'].to_numpy()]
+        w['player_out_id'] = remap['players'][w['player_out_id'].to_numpy()]
+
+        f = part['fielders'].copy()
+        f['delivery_idx'] += n_deliveries
+        f['kind_id'] = remap['kinds'][f['kind_id'].to_numpy()]
+        f['fielder_id'] = remap['players'][f['fielder_id'].to_numpy()]
+
+        deliveries.append(d)
+        wickets.append(w)
+        fielders.append(f)
+        matches.append(part['matches'])
+        n_deliveries += len(d)
+        n_matches += len(part['matches'])
+
+    if not deliveries:
+        return empty_tables()
+
+    return {
+        'deliveries': pd.concat(deliveries, ignore_index=True).astype(DELIVERY_DTYPES),
+        'wickets': pd.concat(wickets, ignore_index=True).astype(WICKET_DTYPES),
+        'fielders': pd.concat(fielders, ignore_index=True).astype(FIELDER_DTYPES),
+        'players': _lookup(lookups['players'], 'name'),
+        'seasons': _lookup(lookups['seasons'], 'season'),
+        'kinds': _lookup(lookups['kinds'], 'kind'),
+        'matches': pd.concat(matches, ignore_index=True),
+    }
+
+
+def drop_matches(tables, members):
+    # Removes every row belonging to the given zip members and renumbers
+    # match ids / delivery indices so the tables stay dense
+    drop = tables['matches']['member'].isin(set(members)).to_numpy()
+    if not drop.any():
+        return tables
+
+    new_match_id = np.cumsum(~drop) - 1
+    d = tables['deliveries']
+    keep_d = ~drop[d['match_id'].to_numpy()]
+    new_delivery_idx = np.cumsum(keep_d) - 1
+
+    out = dict(tables)
+    d = d[keep_d].copy()
+    d['match_id'] = new_match_id[d['match_id'].to_numpy()]
+    out['deliveries'] = d.reset_index(drop=True).astype(DELIVERY_DTYPES)
+
+    for name, dtypes in [('wickets', WICKET_DTYPES), ('fielders', FIELDER_DTYPES)]:
+        t = tables[name]
+        t = t[keep_d[t['delivery_idx'].to_numpy()]].copy()
+        t['delivery_idx'] = new_delivery_idx[t['delivery_idx'].to_numpy()]
+        out[name] = t.reset_index(drop=True).astype(dtypes)
+
+    out['matches'] = tables['matches'][~drop].reset_index(drop=True)
+    return out
+
+
+def save_tables(tables, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name in TABLE_FILES:
+        tables[name].to_parquet(os.path.join(directory, f'{name}.parquet'), index=False)
+
+
+def load_tables(directory, columns=None):
+    # columns: optional {table_name: [cols]} to read only part of a table
+    columns = columns or {}
+    tables = {
+        name: pd.read_parquet(os.path.join(directory, f'{name}.parquet'), columns=columns.get(name))
+        for name in TABLE_FILES
+    }
+    if 'matches' not in columns:
+        # Tables saved before these columns were kept
+        if 'league' not in tables['matches']: tables['matches']['league'] = UNKNOWN_LEAGUE
+        if 'date' not in tables['matches']: tables['matches']['date'] = ''
+    return tables
+
+
+class BallArrays:
+    # Per-ball arrays derived from the tables, shared by every aggregate
+    # (season stats, the aggregator registry, matchups, form) so the extras
+    # rules -- what a batter faced, what a bowler bowled and conceded, which
+    # wickets the bowler is credited with -- are written down once.
+
+    def __init__(self, tables):
+        d, w = tables['deliveries'], tables['wickets']
+        kinds = tables['kinds']['kind'].to_numpy()
+        self.n_players = max(len(tables['players']), 1)
+
+        self.season = d['season_id'].to_numpy(np.int64)
+        self.match = d['match_id'].to_numpy(np.int64)
+        self.batter = d['batter_id'].to_numpy(np.int64)
+        self.bowler = d['bowler_id'].to_numpy(np.int64)
+
+        self.runs_batter = d['runs_batter'].to_numpy(np.int64)
+        self.faced = d['wides'].to_numpy() == 0
+        self.legal = self.faced & (d['noballs'].to_numpy() == 0)
+        self.conceded = (d['runs_total'].to_numpy(np.int64) - d['byes'].to_numpy(np.int64)
+                         - d['legbyes'].to_numpy(np.int64) - d['penalty'].to_numpy(np.int64))
+
+        self.w_idx = w['delivery_idx'].to_numpy(np.int64)
+        self.w_kind = kinds[w['kind_id'].to_numpy()] if len(w) else np.array([], dtype=object)
+        self.w_out = w['player_out_id'].to_numpy(np.int64)
+        self.bowler_wicket = ~np.isin(self.w_kind, NON_BOWLER_WICKETS)
+
+
+def aggregate_season_stats(tables):
+    # Per (season, player) totals, in the order each pair was first seen
+    # while walking the deliveries (batter, bowler, then fielders).
+    d, f = tables['deliveries'], tables['fielders']
+    balls = BallArrays(tables)
+    n_players = balls.n_players
+    kinds = tables['kinds']['kind']
+
+    season, match = balls.season, balls.match
+    bat_key = season * n_players + balls.batter
+    bowl_key = season * n_players + balls.bowler
+
+    w_idx, w_kind = balls.w_idx, balls.w_kind
+    f_idx = f['delivery_idx'].to_numpy(np.int64)
+    f_kind = kinds.to_numpy()[f['kind_id'].to_numpy()] if len(f) else np.array([], dtype=object)
+    f_key = season[f_idx] * n_players + f['fielder_id'].to_numpy(np.int64)
+
+    # Every appearance of a player on a ball, tagged with a sequence number
+    # that reproduces the serial walk order
+    ev_key = np.concatenate([bat_key, bowl_key, f_key])
+    ev_seq = np.concatenate([np.arange(len(d)) * 4, np.arange(len(d)) * 4 + 1, f_idx * 4 + 2])
+    ev_match = np.concatenate([match, match, match[f_idx]])
+
+    order = np.argsort(ev_seq, kind='stable')
+    keys, first_pos = np.unique(ev_key[order], return_index=True)
+    n_keys = len(keys)
+    pos = lambda k: np.searchsorted(keys, k)
+
+    def total(key, weights=None):
+        return np.bincount(pos(key), weights=weights, minlength=n_keys).astype(np.int64)
+
+    runs_batter = balls.runs_batter
+    legal_for_batter, legal_for_bowler, conceded = balls.faced, balls.legal, balls.conceded
+
+    bowler_wkt = balls.bowler_wicket
+    c_and_b = w_kind == 'caught and bowled'
+
+    match_pairs = np.unique(ev_match * n_keys + pos(ev_key))
+
+    stats = pd.DataFrame(0, index=np.arange(n_keys), columns=SEASON_STAT_COLUMNS, dtype=np.int64)
+    stats['matches'] = np.bincount(match_pairs % n_keys, minlength=n_keys)
+    stats['runs_scored'] = total(bat_key, runs_batter)
+    stats['balls_faced'] = total(bat_key[legal_for_batter])
+    stats['fours'] = total(bat_key[runs_batter == 4])
+    stats['sixes'] = total(bat_key[runs_batter == 6])
+    stats['balls_bowled'] = total(bowl_key[legal_for_bowler])
+    stats['runs_conceded'] = total(bowl_key, conceded)
+    stats['wickets'] = total(bowl_key[w_idx[bowler_wkt]])
+    stats['catches'] = total(f_key[f_kind == 'caught']) + total(bowl_key[w_idx[c_and_b]])
+    stats['stumpings'] = total(f_key[f_kind == 'stumped'])
+
+    stats['season'] = tables['seasons']['season'].to_numpy()[keys // n_players] if n_keys else []
+    stats['name'] = tables['players']['name'].to_numpy()[keys % n_players] if n_keys else []
+
+    return stats.iloc[np.argsort(first_pos, kind='stable')].reset_index(drop=True)
+
+
+def aggregate_league_season_stats(tables):
+    # Same totals as aggregate_season_stats, split by league as well: each
+    # match's season id is swapped for a (league, season) id so one pass
+    # covers every league
+    d = tables['deliveries']
+    leagues = tables['matches']['league'].to_numpy()
+    seasons = tables['seasons']['season'].to_numpy()
+
+    match_league = pd.factorize(leagues)[0] if len(leagues) else np.array([], dtype=np.int64)
+    n_seasons = max(len(seasons), 1)
+    combo = match_league[d['match_id'].to_numpy()] * n_seasons + d['season_id'].to_numpy(np.int64)
+    combo_ids, combos = pd.factorize(combo)
+
+    rekeyed = dict(tables)
+    rekeyed['deliveries'] = d.assign(season_id=combo_ids)
+    rekeyed['seasons'] = pd.DataFrame({'season': combos})
+    stats = aggregate_season_stats(rekeyed)
+
+    combo = stats['season'].to_numpy(np.int64)
+    league_names = pd.factorize(leagues)[1] if len(leagues) else np.array([], dtype=object)
+    stats['league'] = np.asarray(league_names, dtype=object)[combo // n_seasons] if len(stats) else []
+    stats['season'] = seasons[combo % n_seasons] if len(stats) else []
+    return stats
@@ -0,0 +1,81 @@
+import threading
+import itertools
+import weakref
+from collections import OrderedDict
+from profiling import count
+
+# Built Plotly figures, shared across sessions and reruns, keyed by
+# (chart, data version, whatever the chart depends on). Least recently used
+# figures are dropped once the serialised specs pass the size budget.
+#
+# The built Figure is what's kept, not its JSON: st.plotly_chart re-validates
+# a plain dict spec into a Figure (about as slow as building it), while a
+# Figure only costs it a to_dict. The budget is therefore charged in JSON
+# bytes, which only approximates memory: a live Figure measured 6-20x its
+# JSON (the dashboard's bar/line charts ~20x, larger scatters ~7x), so 8 MB
+# of JSON is roughly 50-160 MB held. Returned figures are shared, so callers
+# must not modify them.
+
+FIGURE_CACHE_BYTES = 8 * 1024 * 1024     # of figure JSON, not process memory
+
+_versions = itertools.count(1)
+_version_of = weakref.WeakKeyDictionary()
+_version_lock = threading.Lock()
+
+
+def data_version(obj):
+    # A number per loaded data object (store, leaderboards...). A reload
+    # produces a new object, so figures built from the old data stop matching.
+    with _version_lock:
+        if obj not in _version_of:
+            _version_of[obj] = next(_versions)
+        return _version_of[obj]
+
+
+class FigureCache:
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._figures = OrderedDict()     # key -> (figure, spec bytes)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, build):
+        with self._lock:
+            entry = self._figures.get(key)
+            if entry is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            count('figure_cache_hit')
+            return entry[0]
+
+        count('figure_cache_miss')
+        import plotly.io as pio
+        fig = build()
+        size = len(pio.to_json(fig, validate=False))
+        with self._lock:
+            self.misses += 1
+            # Another session may have built the same figure meanwhile
+            if key in self._figures or size > self.max_bytes:
+                return fig
+            self._figures[key] = (fig, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, dropped) = self._figures.popitem(last=False)
+                self.nbytes -= dropped
+                self.evictions += 1
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            calls = self.hits + self.misses
+            return {'entries': len(self._figures), 'bytes': self.nbytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': self.hits / calls if calls else 0.0}
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from deliveries import BallArrays
+
+# Recent-form queries over per-player, per-match stat lines. Rows are kept
+# in (player, date) order with running totals, so "last N matches" or
+# "last N innings" is two lookups and a subtraction per player, for one
+# player or all of them at once. Exponentially decayed averages for a few
+# fixed half-lives are stored per row; the latest row is the current form.
+# The decay runs on match dates, so a match two years back counts for little
+# however few matches the player has played since.
+
+FORM_PATH = 'player_form.parquet'
+FORM_STATS = ['runs', 'balls', 'dismissals', 'wickets', 'balls_bowled', 'runs_conceded']
+BATTING_STATS = ['runs', 'balls', 'dismissals']
+# Decay half-lives, in days
+FORM_HALF_LIVES = [30, 90, 365]
+
+
+def ewm_column(col, half_life):
+    return f'ewm_{col}_{half_life}d'
+
+
+def match_times(df):
+    # Match dates for the decay; the odd match with no date takes its
+    # neighbour's within the player's rows
+    times = pd.to_datetime(df['date'], errors='coerce')
+    grouped = times.groupby(df['name'].to_numpy(), sort=False)
+    return grouped.ffill().fillna(grouped.bfill()).fillna(pd.Timestamp(0))
+
+
+def decayed_mean(values, times, half_life):
+    return values.ewm(halflife=pd.Timedelta(days=half_life), times=times).mean()
+
+
+def build_player_matches(tables, balls=None):
+    # One row per (player, match) where the player batted or bowled
+    balls = BallArrays(tables) if balls is None else balls
+    n_players, match, w_idx = balls.n_players, balls.match, balls.w_idx
+
+    bat_pair = match * n_players + balls.batter
+    bowl_pair = match * n_players + balls.bowler
+    out_pair = match[w_idx] * n_players + balls.w_out
+    pairs, inverse = np.unique(np.concatenate([bat_pair, bowl_pair, out_pair]), return_inverse=True)
+    n, n_balls = len(pairs), len(match)
+    at_bat, at_bowl, at_out = inverse[:n_balls], inverse[n_balls:2 * n_balls], inverse[2 * n_balls:]
+
+    runs_batter, faced, legal, conceded = balls.runs_batter, balls.faced, balls.legal, balls.conceded
+    out = balls.w_kind != 'retired hurt'
+    bowler_wkt = balls.bowler_wicket
+
+    df = pd.DataFrame({
+        'name': tables['players']['name'].to_numpy()[pairs % n_players] if n else [],
+        'date': tables['matches']['date'].to_numpy()[pairs // n_players] if n else [],
+        'match_id': pairs // n_players,
+        'runs': np.bincount(at_bat, runs_batter, minlength=n),
+        'balls': np.bincount(at_bat[faced], minlength=n),
+        'dismissals': np.bincount(at_out[out], minlength=n),
+        'wickets': np.bincount(at_bowl[w_idx[bowler_wkt]], minlength=n),
+        'balls_bowled': np.bincount(at_bowl[legal], minlength=n),
+        'runs_conceded': np.bincount(at_bowl, conceded, minlength=n),
+    })
+    df['batted'] = np.bincount(at_bat, minlength=n) + np.bincount(at_out, minlength=n) > 0
+    for col in FORM_STATS:
+        df[col] = df[col].astype(np.int32)
+    df = df.sort_values(['name', 'date', 'match_id'], kind='stable').reset_index(drop=True)
+
+    # Decayed per-match averages, oldest match first within each player
+    grouped = df.groupby('name', sort=False)
+    times = match_times(df)
+    for hl in FORM_HALF_LIVES:
+        for col in ['runs', 'wickets']:
+            ewm = decayed_mean(grouped[col], times, hl).reset_index(level=0, drop=True)
+            df[ewm_column(col, hl)] = ewm.astype(np.float32)
+    return df
+
+
+def save_player_matches(df, path=FORM_PATH):
+    df.to_parquet(path, index=False)
+
+
+def load_player_matches(path=FORM_PATH):
+    try:
+        return pd.read_parquet(path)
+    except FileNotFoundError:
+        return None
+
+
+class _Runs:
+    # Players' rows as contiguous blocks, with running totals per stat
+
+    def __init__(self, names, values):
+        self.names, starts = np.unique(names, return_index=True)
+        self.starts = starts
+        self.stops = np.r_[starts[1:], len(names)]
+        self.pos = {name: i for i, name in enumerate(self.names)}
+        self.cum = {c: np.r_[0, np.cumsum(v, dtype=np.int64)] for c, v in values.items()}
+
+    def totals(self, rows, n):
+        # rows: player positions; -> {stat: totals over each one's last n rows}, row counts
+        stop, start = self.stops[rows], self.starts[rows]
+        first = np.maximum(start, stop - n)
+        return {c: cum[stop] - cum[first] for c, cum in self.cum.items()}, stop - first
+
+
+class FormIndex:
+
+    def __init__(self, df):
+        self.frame = df
+        self.matches = _Runs(df['name'].to_numpy(), {c: df[c].to_numpy() for c in FORM_STATS})
+        batted = df[df['batted']]
+        self.innings = _Runs(batted['name'].to_numpy(), {c: batted[c].to_numpy() for c in BATTING_STATS})
+        self.names = list(self.matches.names)
+
+    def __contains__(self, name):
+        return name in self.matches.pos
+
+    def _one(self, runs, name, n):
+        i = runs.pos.get(name)
+        if i is None:
+            return None
+        totals, count = runs.totals(np.array([i]), n)
+        return {'matches': int(count[0]), **{c: int(v[0]) for c, v in totals.items()}}
+
+    def last_matches(self, name, n):
+        # Totals over the player's last n matches (or fewer, if that's all there is)
+        return self._one(self.matches, name, n)
+
+    def last_innings(self, name, n):
+        return self._one(self.innings, name, n)
+
+    def window(self, n, innings=False):
+        # Last-n totals for every player at once
+        runs = self.innings if innings else self.matches
+        totals, count = runs.totals(np.arange(len(runs.names)), n)
+        return pd.DataFrame({'name': runs.names, 'matches': count, **totals})
+
+    def decayed(self, name, half_life):
+        # Latest per-match runs and wickets, decayed by match date (half_life in days)
+        i = self.matches.pos.get(name)
+        if i is None:
+            return None
+        if ewm_column('runs', half_life) in self.frame:
+            last = self.frame.iloc[self.matches.stops[i] - 1]
+            return {c: float(last[ewm_column(c, half_life)]) for c in ['runs', 'wickets']}
+        # Other half-lives (or a file from before the date decay) are computed from the player's rows
+        rows = self.frame.iloc[self.matches.starts[i]:self.matches.stops[i]]
+        times = match_times(rows)
+        return {c: float(decayed_mean(rows[c], times, half_life).iloc[-1]) for c in ['runs', 'wickets']}
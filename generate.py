@@ -1,153 +1,266 @@
 import zipfile
 import json
+import argparse
 import pandas as pd
 import os
+import shutil
+import pyarrow as pa
+import pyarrow.dataset as ds
+from concurrent.futures import ProcessPoolExecutor
+from deliveries import (DeliveryTableBuilder, concat_tables, drop_matches, save_tables,
+                        load_tables, aggregate_season_stats, aggregate_league_season_stats)
+from aggregators import ScanContext, run_aggregators
+from matchups import MATCHUPS_PATH, build_matchups, save_matchups
+from form import FORM_PATH, build_player_matches, save_player_matches
+from match_index import MatchFilter, MATCH_INDEX_PATH, filter_members, load_index, save_index
+from profiling import stage, count, begin_run, log_counters
 
 # --- CONFIGURATION ---
 ZIP_FILE_PATH = 'Archive.zip'
 PROFILE_CSV_PATH = 'people.csv'
 OUTPUT_CSV_PATH = 'season_data.csv'
+ADVANCED_CSV_PATH = 'season_advanced.csv'
+SEASON_DATASET_DIR = 'season_dataset'
+MANIFEST_PATH = 'season_manifest.json'
+DELIVERIES_DIR = 'deliveries'
 
-def get_empty_season_stats():
-    return {
-        'matches': 0,
-        'innings_batted': 0,
-        'runs_scored': 0,
-        'balls_faced': 0,
-        'fours': 0,
-        'sixes': 0,
-        'not_outs': 0,
-        'high_score': 0,
-        'centuries': 0,
-        'fifties': 0,
-        'innings_bowled': 0,
-        'balls_bowled': 0,
-        'runs_conceded': 0,
-        'wickets': 0,
-        'catches': 0,
-        'stumpings': 0
-    }
+def aggregate_members(zip_path, members, log_every=100):
+    # Worker entry point: each process opens its own handle on the zip and
+    # returns the delivery tables for its members, with its parse counts
+    # (counters in a worker process would be lost with it)
+    builder = DeliveryTableBuilder()
+    total_files = len(members)
+    counts = {'json_errors': 0, 'matches_parsed': 0}
+
+    with zipfile.ZipFile(zip_path, 'r') as z:
+        for i, filename in enumerate(members):
+            if log_every and i % log_every == 0: print(f"Processing {i}/{total_files}...")
 
-def process_season_stats():
-    print(f"Reading {ZIP_FILE_PATH}...")
-    
-    # Key: (Season, Player Name) -> Stats Dict
-    season_stats = {}
-
-    with zipfile.ZipFile(ZIP_FILE_PATH, 'r') as z:
-        json_files = [f for f in z.namelist() if f.endswith('.json')]
-        total_files = len(json_files)
-        
-        for i, filename in enumerate(json_files):
-            if i % 100 == 0: print(f"Processing {i}/{total_files}...")
-            
             with z.open(filename) as f:
                 try:
                     match_data = json.load(f)
                 except:
+                    counts['json_errors'] += 1
                     continue
 
-                if 'innings' not in match_data or 'info' not in match_data:
-                    continue
-                
-                # Get Season (Clean it up, e.g., "2007/08" -> "2008")
-                raw_season = str(match_data['info'].get('season', 'Unknown'))
-                # Simple cleaning: take the first 4 digits if it looks like a year
-                season = raw_season.split('/')[0] if '/' in raw_season else raw_season
-
-                players_in_match = set()
-
-                for inning in match_data['innings']:
-                    if 'overs' not in inning: continue
-                    
-                    for over in inning['overs']:
-                        for ball in over['deliveries']:
-                            batter = ball['batter']
-                            bowler = ball['bowler']
-                            players_in_match.add(batter)
-                            players_in_match.add(bowler)
-
-                            # Init Stats
-                            if (season, batter) not in season_stats: season_stats[(season, batter)] = get_empty_season_stats()
-                            if (season, bowler) not in season_stats: season_stats[(season, bowler)] = get_empty_season_stats()
-
-                            # --- BATTING ---
-                            s_bat = season_stats[(season, batter)]
-                            runs_bat = ball['runs']['batter']
-                            s_bat['runs_scored'] += runs_bat
-                            
-                            if runs_bat == 4: s_bat['fours'] += 1
-                            if runs_bat == 6: s_bat['sixes'] += 1
-                            
-                            # Legal balls for SR
-                            if 'wides' not in ball.get('extras', {}):
-                                s_bat['balls_faced'] += 1
-
-                            # --- BOWLING ---
-                            s_bowl = season_stats[(season, bowler)]
-                            # Runs conceded (Total - Byes/Legbyes)
-                            extras = ball.get('extras', {})
-                            deduct = extras.get('byes', 0) + extras.get('legbyes', 0) + extras.get('penalty', 0)
-                            s_bowl['runs_conceded'] += (ball['runs']['total'] - deduct)
-                            
-                            if 'wides' not in extras and 'noballs' not in extras:
-                                s_bowl['balls_bowled'] += 1
-
-                            # --- WICKETS & FIELDING ---
-                            if 'wickets' in ball:
-                                for w in ball['wickets']:
-                                    kind = w['kind']
-                                    player_out = w['player_out']
-
-                                    # Batting: Out?
-                                    # (Complex to track "not outs" perfectly in this simplified loop, 
-                                    #  but we can count dismissals to calc avg later)
-                                    
-                                    # Bowling Wicket
-                                    if kind not in ['run out', 'retired hurt', 'obstructing the field']:
-                                        s_bowl['wickets'] += 1
-                                    
-                                    # Fielding
-                                    if 'fielders' in w:
-                                        for fielder in w['fielders']:
-                                            fname = fielder['name']
-                                            players_in_match.add(fname)
-                                            if (season, fname) not in season_stats: 
-                                                season_stats[(season, fname)] = get_empty_season_stats()
-                                            
-                                            if kind == 'caught':
-                                                season_stats[(season, fname)]['catches'] += 1
-                                            elif kind == 'stumped':
-                                                season_stats[(season, fname)]['stumpings'] += 1
-                                    
-                                    if kind == 'caught and bowled':
-                                        s_bowl['catches'] += 1
-
-                # Count Matches
-                for p in players_in_match:
-                    if (season, p) not in season_stats: season_stats[(season, p)] = get_empty_season_stats()
-                    season_stats[(season, p)]['matches'] += 1
-
-    # --- EXPORT ---
+            if builder.add_match(filename, match_data):
+                counts['matches_parsed'] += 1
+
+    return builder.to_tables(), counts
+
+def split_into_shards(members, n_shards):
+    size, rem = divmod(len(members), n_shards)
+    shards, start = [], 0
+    for i in range(n_shards):
+        end = start + size + (1 if i < rem else 0)
+        if end > start: shards.append(members[start:end])
+        start = end
+    return shards
+
+def export_season_stats(tables):
     print("Exporting...")
-    data = []
-    for (season, name), stats in season_stats.items():
-        row = stats.copy()
-        row['season'] = season
-        row['name'] = name
-        data.append(row)
-    
-    df = pd.DataFrame(data)
-    
+    with stage('ingest:aggregate_season', deliveries=len(tables['deliveries'])) as s:
+        df = aggregate_season_stats(tables)
+        s['rows'] = len(df)
+
     # Merge Profiles (Optional)
-    try:
-        profiles = pd.read_csv(PROFILE_CSV_PATH)
-        df = pd.merge(df, profiles, on='name', how='left')
-    except:
-        pass
+    with stage('ingest:merge_profiles'):
+        try:
+            profiles = pd.read_csv(PROFILE_CSV_PATH)
+            df = pd.merge(df, profiles, on='name', how='left')
+        except:
+            pass
 
-    df.to_csv(OUTPUT_CSV_PATH, index=False)
+    with stage('ingest:write_csv'):
+        df.to_csv(OUTPUT_CSV_PATH, index=False)
     print(f"Done! Saved to {OUTPUT_CSV_PATH}")
 
+def export_season_dataset(tables):
+    # Per-(league, season) stats as Parquet, one directory per partition:
+    #   season_dataset/league=<event name>/season=<year>/*.parquet
+    # so the app can read just the slice it shows. Profile columns stay in
+    # season_data.csv.
+    with stage('ingest:season_dataset', deliveries=len(tables['deliveries'])) as s:
+        df = aggregate_league_season_stats(tables)
+        df['season'] = df['season'].astype(str)
+        s['rows'] = len(df)
+        if df.empty:
+            # write_dataset writes nothing for an empty frame; keep the old copy
+            print(f"No season rows; {SEASON_DATASET_DIR}/ left as it was")
+            return
+
+        # Written beside the old copy and swapped in, so readers never see a
+        # partial dataset; the old copy is only deleted once the new one is in place
+        tmp, old = SEASON_DATASET_DIR + '.tmp', SEASON_DATASET_DIR + '.old'
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(old, ignore_errors=True)
+        ds.write_dataset(pa.Table.from_pandas(df, preserve_index=False), tmp, format='parquet',
+                         partitioning=['league', 'season'], partitioning_flavor='hive')
+        if os.path.isdir(SEASON_DATASET_DIR):
+            os.replace(SEASON_DATASET_DIR, old)
+        os.replace(tmp, SEASON_DATASET_DIR)
+        shutil.rmtree(old, ignore_errors=True)
+    print(f"Saved {df['league'].nunique()} league(s) to {SEASON_DATASET_DIR}/")
+
+def export_matchups(tables, ctx=None):
+    with stage('ingest:matchups', deliveries=len(tables['deliveries'])) as s:
+        df = build_matchups(tables, ctx)
+        save_matchups(df, MATCHUPS_PATH)
+        s['pairs'] = len(df)
+    print(f"Saved {len(df)} batter/bowler/season matchups to {MATCHUPS_PATH}")
+
+def export_player_form(tables, ctx=None):
+    # Per-player, per-match lines for the rolling-form index
+    with stage('ingest:player_form', deliveries=len(tables['deliveries'])) as s:
+        df = build_player_matches(tables, ctx)
+        save_player_matches(df, FORM_PATH)
+        s['rows'] = len(df)
+    print(f"Saved {len(df)} player-match lines to {FORM_PATH}")
+
+def export_advanced_stats(tables, ctx=None):
+    # Phase splits, dot balls, dismissals etc. from the registered aggregators,
+    # computed from the same tables (no second pass over the zip)
+    with stage('ingest:aggregators', deliveries=len(tables['deliveries'])) as s:
+        df = run_aggregators(tables, timer=lambda name: stage(f'ingest:aggregator:{name}'), ctx=ctx)
+        s['rows'] = len(df)
+    df.to_csv(ADVANCED_CSV_PATH, index=False)
+    print(f"Saved {len(df.columns) - 2} advanced stats to {ADVANCED_CSV_PATH}")
+
+def export_all(tables):
+    export_season_stats(tables)
+    export_season_dataset(tables)
+    # The aggregators, matchups and form all read the same per-ball arrays
+    with stage('ingest:scan_context', deliveries=len(tables['deliveries'])):
+        ctx = ScanContext(tables)
+    export_advanced_stats(tables, ctx)
+    export_matchups(tables, ctx)
+    export_player_form(tables, ctx)
+
+def aggregate(json_files, workers=1):
+    workers = max(1, min(workers, len(json_files)))
+
+    with stage('ingest:parse', files=len(json_files), workers=workers) as s:
+        if workers == 1:
+            tables, counts = aggregate_members(ZIP_FILE_PATH, json_files)
+        else:
+            # Several shards per worker keeps the pool busy when match sizes vary
+            shards = split_into_shards(json_files, workers * 4)
+            print(f"Processing {len(json_files)} files in {len(shards)} shards on {workers} workers...")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(aggregate_members, [ZIP_FILE_PATH] * len(shards), shards, [0] * len(shards)))
+            tables = concat_tables([t for t, _ in partials])
+            counts = {k: sum(c[k] for _, c in partials) for k in partials[0][1]}
+        s['deliveries'] = len(tables['deliveries'])
+        s.update(counts)
+    for name, n in counts.items():
+        count(f'ingest:{name}', n)
+    return tables
+
+def list_match_hashes(z):
+    # The zip directory already stores a CRC32 + size per member, which is
+    # enough to spot new or rewritten match files without reading them
+    return {
+        info.filename: f"{info.CRC:08x}-{info.file_size}"
+        for info in z.infolist() if info.filename.endswith('.json')
+    }
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def save_manifest(match_hashes):
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump({'zip': ZIP_FILE_PATH, 'matches': match_hashes}, f, indent=0, sort_keys=True)
+
+def select_matches(z, match_hashes, match_filter, use_index=True):
+    # Keeps only members whose info block passes the filter; the index lets
+    # later runs decide without reading the member at all
+    index = load_index(MATCH_INDEX_PATH) if use_index else None
+    with stage('ingest:filter', members=len(match_hashes)) as s:
+        accepted, stats = filter_members(z, match_hashes, match_filter, index)
+        s.update(stats, accepted=len(accepted), filtered_out=len(match_hashes) - len(accepted))
+    if index is not None:
+        save_index(index, MATCH_INDEX_PATH)
+
+    count('ingest:filtered_out', len(match_hashes) - len(accepted))
+    print(f"Filter kept {len(accepted)}/{len(match_hashes)} matches "
+          f"({stats['index_hits']} from {MATCH_INDEX_PATH}, {stats['prefix_reads']} prefix reads, "
+          f"{stats['full_reads']} full reads)")
+    return {m: match_hashes[m] for m in accepted}
+
+def process_season_stats(workers=1, full=False, match_filter=None, use_index=True):
+    begin_run('generate')
+    print(f"Reading {ZIP_FILE_PATH}...")
+
+    with stage('ingest:list_members'), zipfile.ZipFile(ZIP_FILE_PATH, 'r') as z:
+        match_hashes = list_match_hashes(z)
+        # Filtered-out members simply aren't in match_hashes, so an
+        # incremental run drops them like deleted matches
+        if match_filter:
+            match_hashes = select_matches(z, match_hashes, match_filter, use_index)
+    json_files = list(match_hashes)
+
+    manifest = None if full else load_manifest()
+    if manifest is not None and (manifest.get('zip') != ZIP_FILE_PATH or not os.path.isdir(DELIVERIES_DIR)):
+        manifest = None
+
+    if manifest is None:
+        tables = aggregate(json_files, workers)
+    else:
+        seen = manifest['matches']
+        stale = [f for f, h in seen.items() if match_hashes.get(f) != h]
+        to_parse = [f for f in json_files if seen.get(f) != match_hashes[f]]
+
+        if not to_parse and not stale:
+            print(f"No new matches. {OUTPUT_CSV_PATH} is up to date.")
+            log_counters('ingest:counters')
+            return
+
+        # Edited or removed matches are dropped from the stored deliveries;
+        # new and edited ones are parsed and appended. Anything about to be
+        # parsed is dropped too: a run that died after save_tables left it
+        # stored without recording it in the manifest
+        print(f"Incremental update: {len(to_parse)} new/changed matches, {len(stale)} dropped or replaced...")
+        with stage('ingest:load_tables'):
+            tables = drop_matches(load_tables(DELIVERIES_DIR), stale + to_parse)
+        if to_parse:
+            tables = concat_tables([tables, aggregate(to_parse, workers)])
+
+    with stage('ingest:save_tables'):
+        save_tables(tables, DELIVERIES_DIR)
+    export_all(tables)
+    save_manifest(match_hashes)
+    log_counters('ingest:counters')
+
+def reaggregate_season_stats():
+    # Re-export every output from the stored deliveries without touching the zip
+    print(f"Reading {DELIVERIES_DIR}/...")
+    export_all(load_tables(DELIVERIES_DIR))
+
 if __name__ == "__main__":
-    process_season_stats()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Aggregate Cricsheet match JSON into per-season player stats.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Parse the archive in N worker processes (default: 1, serial)")
+    parser.add_argument('--full', action='store_true',
+                        help=f"Ignore {MANIFEST_PATH} and rebuild {OUTPUT_CSV_PATH} from every match")
+    parser.add_argument('--from-deliveries', action='store_true',
+                        help=f"Recompute {OUTPUT_CSV_PATH}, {SEASON_DATASET_DIR}/, {ADVANCED_CSV_PATH}, {MATCHUPS_PATH} and {FORM_PATH} from {DELIVERIES_DIR}/ only, skipping the zip")
+    filters = parser.add_argument_group('match filters', "Checked against each match's info block before its deliveries are parsed")
+    filters.add_argument('--event', action='append', help="Event/league name substring, e.g. 'Indian Premier League' (repeatable)")
+    filters.add_argument('--season-from', type=int)
+    filters.add_argument('--season-to', type=int)
+    filters.add_argument('--date-from', help="YYYY-MM-DD, first day of the match")
+    filters.add_argument('--date-to', help="YYYY-MM-DD")
+    filters.add_argument('--match-type', action='append', help="e.g. T20 (repeatable)")
+    filters.add_argument('--no-index', action='store_true', help=f"Don't read or update {MATCH_INDEX_PATH}")
+    args = parser.parse_args()
+    if args.from_deliveries:
+        reaggregate_season_stats()
+    else:
+        match_filter = MatchFilter(events=args.event, season_from=args.season_from, season_to=args.season_to,
+                                   date_from=args.date_from, date_to=args.date_to, match_types=args.match_type)
+        process_season_stats(workers=args.workers, full=args.full, match_filter=match_filter,
+                             use_index=not args.no_index)
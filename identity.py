@@ -0,0 +1,264 @@
+import os
+import re
+import hashlib
+import tempfile
+import unicodedata
+from difflib import SequenceMatcher
+import pandas as pd
+
+# Maps player names (and provider keys, where a source has them) from any of
+# our datasets onto Cricsheet identifiers from people.csv.
+#
+# Lookups go from cheapest to most expensive: exact provider key, exact
+# normalised name, surname block + compatible initials ("Ruturaj Gaikwad" ->
+# "RD Gaikwad"), and finally fuzzy string matching within the surname block.
+# Ambiguous hits are narrowed to `preferred` ids (players who actually appear
+# in season_data.csv), then to Cricsheet's unsuffixed namesake, before giving up.
+
+PEOPLE_CSV_PATH = 'people.csv'
+IDENTITY_MAP_PATH = 'identity_map.csv'
+
+FUZZY_THRESHOLD = 0.85
+FUZZY_MARGIN = 0.05
+SURNAME_PARTICLES = {'de', 'du', 'van', 'der', 'den', 'von', 'ul', 'ur', 'al', 'el', 'bin'}
+
+
+def normalise_name(raw):
+    text = unicodedata.normalize('NFKD', str(raw)).encode('ascii', 'ignore').decode()
+    text = re.sub(r"[^A-Za-z ]+", ' ', text.replace('-', ' '))
+    return ' '.join(text.lower().split())
+
+
+def parse_name(raw):
+    # -> (surname, initials, first given name or None), all lowercase
+    tokens = re.sub(r"[^A-Za-z ]+", ' ', unicodedata.normalize('NFKD', str(raw))
+                    .encode('ascii', 'ignore').decode().replace('-', ' ')).split()
+    if not tokens:
+        return '', '', None
+
+    # Surname is the last token plus any lowercase particles before it
+    cut = len(tokens) - 1
+    while cut > 1 and tokens[cut - 1].lower() in SURNAME_PARTICLES:
+        cut -= 1
+    given, surname = tokens[:cut], ' '.join(tokens[cut:]).lower()
+
+    initials, first_name = '', None
+    for tok in given:
+        if tok.isupper() and len(tok) <= 3:
+            initials += tok.lower()
+        else:
+            initials += tok[0].lower()
+            if first_name is None: first_name = tok.lower()
+    return surname, initials, first_name
+
+
+def is_subsequence(short, long):
+    it = iter(long)
+    return all(ch in it for ch in short)
+
+
+def clean_key(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+class IdentityIndex:
+
+    def __init__(self, people, preferred=None):
+        self.preferred = set() if preferred is None else set(preferred)
+        self.key_cols = [c for c in people.columns if c.startswith('key_')]
+        self.by_key = {}
+        self.by_name = {}
+        self.blocks = {}
+        self.prefix_blocks = {}
+        self.full_names = {}
+        self.initials = {}
+        self.first_names = {}
+        # Cricsheet suffixes namesakes "(2)", "(3)"; the unsuffixed one wins ties
+        self.canonical = set()
+
+        for row in people.itertuples(index=False):
+            pid = row.identifier
+            for col in self.key_cols:
+                key = clean_key(getattr(row, col))
+                if key is not None:
+                    self.by_key.setdefault((col, key), pid)
+
+            unique_name = row.name if pd.isna(row.unique_name) else row.unique_name
+            if not re.search(r"\(\d+\)$", unique_name):
+                self.canonical.add(pid)
+            self.full_names[pid] = normalise_name(re.sub(r"\(\d+\)$", '', unique_name))
+
+            for raw in {row.name, unique_name}:
+                if pd.isna(raw): continue
+                self.by_name.setdefault(normalise_name(raw), set()).add(pid)
+                surname, initials, first_name = parse_name(raw)
+                self.blocks.setdefault(surname, set()).add(pid)
+                self.prefix_blocks.setdefault(surname[:3], set()).add(pid)
+                self.initials.setdefault(pid, set()).add(initials)
+                if first_name: self.first_names.setdefault(pid, first_name)
+
+        self._cache = {}
+
+    @classmethod
+    def from_csv(cls, path=PEOPLE_CSV_PATH, preferred=None):
+        return cls(pd.read_csv(path, dtype=str), preferred)
+
+    def _narrow(self, ids):
+        ids = set(ids)
+        for tie_break in (self.preferred, self.canonical):
+            if len(ids) > 1:
+                narrowed = ids & tie_break
+                if narrowed: ids = narrowed
+        return next(iter(ids)) if len(ids) == 1 else None
+
+    def resolve(self, name, keys=None):
+        # -> (identifier or None, method, score)
+        for col, value in (keys or {}).items():
+            pid = self.by_key.get((col, clean_key(value)))
+            if pid is not None:
+                return pid, 'key', 1.0
+
+        if pd.isna(name):
+            return None, 'unresolved', 0.0
+        if name in self._cache:
+            return self._cache[name]
+        result = self._resolve_name(name)
+        self._cache[name] = result
+        return result
+
+    def _resolve_name(self, name):
+        norm = normalise_name(name)
+        exact = self._narrow(self.by_name.get(norm, ()))
+        if exact is not None and (not self.preferred or exact in self.preferred):
+            return exact, 'exact', 1.0
+
+        surname, initials, first_name = parse_name(name)
+        strong, weak = set(), set()
+        for cand in self.blocks.get(surname, ()):
+            # Two spelled-out first names have to agree ("Amit" != "Ankit")
+            cand_first = self.first_names.get(cand)
+            if first_name and cand_first and first_name != cand_first:
+                continue
+            for cand_initials in self.initials[cand]:
+                if not initials or not cand_initials:
+                    continue
+                if cand_initials.startswith(initials) or initials.startswith(cand_initials):
+                    strong.add(cand)
+                elif is_subsequence(initials, cand_initials):
+                    # "Dinesh Karthik" -> "KD Karthik"
+                    weak.add(cand)
+
+        # A namesake with the exact spelling loses to a single preferred
+        # player under initials ("Rohit Sharma" -> "RG Sharma")
+        if exact is not None:
+            preferred_hits = (strong or weak) & self.preferred
+            if len(preferred_hits) == 1:
+                return preferred_hits.pop(), 'initials', 0.9
+            return exact, 'exact', 1.0
+
+        # Out-of-order initials only count when nothing matched in order
+        pid = self._narrow(strong or weak)
+        if pid is not None:
+            return pid, 'initials', 0.9
+        if strong:
+            return None, 'ambiguous', 0.0
+
+        # Fuzzy fallback, only against people sharing the surname prefix
+        scored = sorted(
+            ((SequenceMatcher(None, norm, self.full_names[c]).ratio(), c in self.preferred, c)
+             for c in self.prefix_blocks.get(surname[:3], ())),
+            reverse=True,
+        )
+        if scored and scored[0][0] >= FUZZY_THRESHOLD:
+            if len(scored) == 1 or scored[0][0] - scored[1][0] >= FUZZY_MARGIN or (scored[0][1] and not scored[1][1]):
+                return scored[0][2], 'fuzzy', round(scored[0][0], 3)
+
+        return None, 'unresolved', 0.0
+
+    def resolve_frame(self, df, name_col, key_cols=()):
+        key_cols = [c for c in key_cols if c in df.columns]
+        if not key_cols:
+            ids = {n: self.resolve(n)[0] for n in df[name_col].dropna().unique()}
+            return df[name_col].map(ids)
+        return pd.Series(
+            [self.resolve(getattr(r, name_col), {c: getattr(r, c) for c in key_cols})[0]
+             for r in df[[name_col] + key_cols].itertuples(index=False)],
+            index=df.index,
+        )
+
+
+def file_hash(path):
+    # sha1 of a file's bytes, or None if it isn't there; artifacts.py uses it too
+    try:
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        return h.hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def people_hash(path=PEOPLE_CSV_PATH):
+    return file_hash(path)
+
+
+def preferred_hash(preferred):
+    # The preferred ids drive tie-breaks, so resolutions depend on them too
+    ids = sorted({str(p) for p in ([] if preferred is None else preferred)})
+    return hashlib.sha1('\n'.join(ids).encode()).hexdigest()
+
+
+def load_identity_map(names_by_source, preferred=None, people_path=None, map_path=None):
+    # names_by_source: {source: iterable of raw names}. Returns a frame with
+    # one row per (source, raw_name). Previous results are reused from
+    # map_path as long as people.csv and the preferred ids haven't changed;
+    # only new names are resolved.
+    people_path = people_path or PEOPLE_CSV_PATH
+    map_path = map_path or IDENTITY_MAP_PATH
+    current_hash = people_hash(people_path)
+    current_preferred = preferred_hash(preferred)
+    try:
+        cached = pd.read_csv(map_path, dtype={'identifier': str, 'raw_name': str, 'source': str,
+                                              'people_hash': str, 'preferred_hash': str})
+        cached = cached[(cached['people_hash'] == current_hash) & (cached['preferred_hash'] == current_preferred)]
+    except (FileNotFoundError, KeyError):
+        cached = pd.DataFrame(columns=['source', 'raw_name', 'identifier', 'method', 'score',
+                                       'people_hash', 'preferred_hash'])
+
+    known = set(zip(cached['source'], cached['raw_name']))
+    wanted = [(src, n) for src, names in names_by_source.items() for n in pd.unique(pd.Series(list(names)).dropna())]
+    missing = [(src, n) for src, n in wanted if (src, n) not in known]
+
+    if missing:
+        index = IdentityIndex.from_csv(people_path, preferred)
+        rows = []
+        for src, n in missing:
+            pid, method, score = index.resolve(n)
+            rows.append({'source': src, 'raw_name': n, 'identifier': pid, 'method': method,
+                         'score': score, 'people_hash': current_hash, 'preferred_hash': current_preferred})
+        cached = pd.concat([cached, pd.DataFrame(rows)], ignore_index=True) if len(cached) else pd.DataFrame(rows)
+        # A temp file per writer: replicas starting together would otherwise
+        # race on one shared .tmp name
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(map_path) or '.', suffix='.tmp')
+        with os.fdopen(fd, 'w', newline='') as f:
+            cached.to_csv(f, index=False)
+        os.replace(tmp, map_path)
+
+    return cached
+
+
+def attach_player_ids(df, name_col, source, identity_map):
+    # Adds `player_id` (Cricsheet identifier) and `player_key`, which falls
+    # back to the lowercased name so unresolved players still join
+    # consistently across sources
+    m = identity_map[identity_map['source'] == source]
+    ids = dict(zip(m['raw_name'], m['identifier']))
+    df['player_id'] = df[name_col].map(ids)
+    df['player_key'] = df['player_id'].where(df['player_id'].notna(),
+                                             'name:' + df[name_col].str.lower().str.strip())
+    return df
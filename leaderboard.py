@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from metrics import strike_rate, economy, all_rounder_score
+
+# Top-K rankings for the Hall of Fame. Season rows are summed once into a
+# player x season prefix-sum table, so the totals for any season range are
+# one subtraction per player, and the top K come from np.argpartition rather
+# than a full sort. Results are memoised per (metric, range, minimum, k):
+# the single-season boards at default settings are kept for good, anything
+# else a user picks goes through a bounded LRU shared by all sessions.
+
+TOTAL_COLUMNS = ['matches', 'runs_scored', 'balls_faced', 'wickets', 'balls_bowled', 'runs_conceded']
+
+# metric -> (sort ascending, qualifying column, default minimum)
+LEADERBOARD_METRICS = {
+    'runs_scored': (False, None, 0),
+    'wickets': (False, None, 0),
+    'all_rounder_score': (False, None, 0),
+    'batting_sr': (False, 'balls_faced', 100),
+    'bowling_economy': (True, 'balls_bowled', 120),
+}
+DEFAULT_K = 25
+MEMO_SIZE = 256
+
+
+def top_k(values, k, ascending=False, eligible=None):
+    # Indices of the k best values, best first; ties keep index order
+    idx = np.arange(len(values)) if eligible is None else np.flatnonzero(eligible)
+    scores = values[idx] if ascending else -values[idx]
+    if len(idx) > k:
+        # Everything level with the k-th value goes through, so the index
+        # tie-break below (not argpartition) decides who makes the cut
+        kth = np.partition(scores, k - 1)[k - 1]
+        keep = scores <= kth
+        idx, scores = idx[keep], scores[keep]
+    return idx[np.lexsort((idx, scores))][:k]
+
+
+class Leaderboards:
+
+    def __init__(self, season_df, k=DEFAULT_K, memo_size=MEMO_SIZE):
+        self.k = k
+        self.memo_size = memo_size
+        codes, self.names = pd.factorize(season_df['name'].astype(str), sort=True)
+        self.seasons = sorted(season_df['season'].astype(str).unique())
+        season_pos = np.searchsorted(self.seasons, season_df['season'].astype(str).to_numpy())
+
+        n_players, n_seasons = len(self.names), len(self.seasons)
+        cell = codes * n_seasons + season_pos
+        self._prefix = {}
+        for col in TOTAL_COLUMNS:
+            grid = np.bincount(cell, weights=season_df[col].to_numpy(np.float64),
+                               minlength=n_players * n_seasons).reshape(n_players, n_seasons)
+            # prefix[:, j] = total over the first j seasons
+            self._prefix[col] = np.concatenate([np.zeros((n_players, 1)), grid.cumsum(axis=1)], axis=1).astype(np.int64)
+        self._pinned = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Every single season at the default minimums up front; ranges fill in on demand
+        for season in self.seasons:
+            for metric in LEADERBOARD_METRICS:
+                self._pinned[self._key(metric, season, season, None, None)] = self._build(metric, season, season)
+
+    def _span(self, first, last):
+        lo = 0 if first is None else self.seasons.index(first)
+        hi = len(self.seasons) if last is None else self.seasons.index(last) + 1
+        return lo, hi
+
+    def totals(self, first=None, last=None):
+        # Per-player totals and derived stats over a season range (None = all)
+        lo, hi = self._span(first, last)
+        t = {col: p[:, hi] - p[:, lo] for col, p in self._prefix.items()}
+        t['batting_sr'] = np.round(strike_rate(t['runs_scored'], t['balls_faced']), 2)
+        t['bowling_economy'] = np.round(economy(t['runs_conceded'], t['balls_bowled']), 2)
+        t['all_rounder_score'] = all_rounder_score(t['runs_scored'], t['wickets'])
+        return t
+
+    def _key(self, metric, first, last, minimum, k):
+        minimum = LEADERBOARD_METRICS[metric][2] if minimum is None else minimum
+        return (metric, self._span(first, last), minimum, k or self.k)
+
+    def _build(self, metric, first=None, last=None, minimum=None, k=None):
+        ascending, qualify_col, default_min = LEADERBOARD_METRICS[metric]
+        minimum = default_min if minimum is None else minimum
+        t = self.totals(first, last)
+        eligible = t['matches'] > 0
+        if qualify_col:
+            eligible &= t[qualify_col] >= max(minimum, 1)
+        idx = top_k(t[metric].astype(np.float64), k or self.k, ascending, eligible)
+        board = pd.DataFrame({'name': self.names[idx], **{c: v[idx] for c, v in t.items()}})
+        board.insert(0, 'rank', np.arange(1, len(board) + 1))
+        return board
+
+    def top(self, metric, first=None, last=None, minimum=None, k=None):
+        # Returned boards are shared, so callers must not modify them
+        key = self._key(metric, first, last, minimum, k)
+        board = self._pinned.get(key)
+        if board is not None:
+            return board
+        with self._lock:
+            board = self._cache.get(key)
+            if board is not None:
+                self._cache.move_to_end(key)
+                return board
+
+        board = self._build(metric, first, last, minimum, k)
+        with self._lock:
+            # Another session may have built the same board meanwhile
+            board = self._cache.setdefault(key, board)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.memo_size:
+                self._cache.popitem(last=False)
+        return board
@@ -0,0 +1,179 @@
+import os
+from urllib.parse import unquote
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from deliveries import SEASON_STAT_COLUMNS
+from metrics import add_season_metrics, add_career_metrics
+from identity import load_identity_map, attach_player_ids
+from schema import compact_season_frame, compact_career_frame, identity_table, is_identity_column
+from profiling import Lap
+
+# Builds the app's frames from the source CSVs. Kept free of Streamlit so the
+# artifact build step (artifacts.py) can run it from the command line.
+
+SEASON_CSV_PATH = 'season_data.csv'
+MASTER_CSV_PATH = 'master_data.csv'
+AUCTION_CSV_PATH = 'IPL_Master_Player_Data copy.csv'
+STATS_CSV_PATH = 'cricket_data copy.csv'
+SEASON_DATASET_DIR = 'season_dataset'
+
+# Partition values are kept as strings ("Unknown" can appear as a season)
+DATASET_PARTITIONING = ds.partitioning(pa.schema([('league', pa.string()), ('season', pa.string())]), flavor='hive')
+
+def dataset_partitions():
+    # (league, season) pairs in the partitioned dataset, from directory names
+    # alone; empty when generate.py hasn't written one
+    rows = []
+    if os.path.isdir(SEASON_DATASET_DIR):
+        for league_dir in os.listdir(SEASON_DATASET_DIR):
+            if not league_dir.startswith('league='): continue
+            for season_dir in os.listdir(os.path.join(SEASON_DATASET_DIR, league_dir)):
+                if season_dir.startswith('season='):
+                    rows.append((unquote(league_dir[7:]), unquote(season_dir[7:])))
+    return pd.DataFrame(sorted(rows), columns=['league', 'season'])
+
+def read_season_slice(leagues, seasons):
+    # Only the matching partitions are opened (the filter is on partition
+    # keys) and only the stat columns are read
+    dataset = ds.dataset(SEASON_DATASET_DIR, format='parquet', partitioning=DATASET_PARTITIONING)
+    table = dataset.to_table(
+        columns=['league', 'season', 'name'] + SEASON_STAT_COLUMNS,
+        filter=ds.field('league').isin(list(leagues)) & ds.field('season').isin(list(seasons)),
+    )
+    df = table.to_pandas()
+
+    # A player who appeared in two leagues in one season gets one combined row
+    if df['league'].nunique() > 1:
+        agg = {c: 'sum' for c in SEASON_STAT_COLUMNS}
+        agg['high_score'] = 'max'
+        df = df.groupby(['name', 'season'], sort=False, as_index=False).agg(agg)
+    return df.drop(columns=['league'], errors='ignore')
+
+def build_dashboard_frames(compact=True, leagues=None, seasons=None):
+    lap = Lap('load:dashboard')
+
+    # 1. Load Season Data (Ball-by-ball aggregated)
+    # The identity columns are skipped here; see build_identity_frames.
+    # With leagues/seasons, only that slice of the partitioned dataset is read.
+    if leagues is not None or seasons is not None:
+        parts = dataset_partitions()
+        if parts.empty:
+            return None, None
+        df = read_season_slice(parts['league'].unique() if leagues is None else leagues,
+                               parts['season'].unique() if seasons is None else seasons)
+        lap.mark('read_season_dataset', rows=len(df))
+    else:
+        try:
+            df = pd.read_csv(SEASON_CSV_PATH, usecols=(lambda c: not is_identity_column(c)) if compact else None)
+            df['season'] = df['season'].astype(str)
+        except FileNotFoundError:
+            return None, None
+        # The people.csv merge in generate.py repeats a season row once per
+        # profile sharing the player's name; without the profile columns
+        # those rows are identical copies
+        df = df.drop_duplicates(['name', 'season'], ignore_index=True)
+        lap.mark('read_season_csv', rows=len(df))
+
+    # Calculate Season Metrics
+    add_season_metrics(df)
+    lap.mark('season_metrics')
+
+    # 2. Load Master Data (For accurate 100s, 50s, 4s, 6s, 5w)
+    try:
+        master_data = pd.read_csv(MASTER_CSV_PATH)
+        # Ensure we have the specific columns needed
+        cols_to_merge = ['name', 'centuries', 'fifties', 'sixes', 'fours', '5_wickets']
+        master_subset = master_data[cols_to_merge].drop_duplicates('name')
+    except (FileNotFoundError, KeyError):
+        master_subset = pd.DataFrame(columns=['name', 'centuries', 'fifties', 'sixes', 'fours', '5_wickets'])
+    lap.mark('read_master_csv')
+
+    # 3. Aggregation
+    sum_cols = ['matches', 'runs_scored', 'balls_faced', 'wickets', 'balls_bowled', 'runs_conceded', 'catches']
+    career_df = df.groupby('name')[sum_cols].sum().reset_index()
+    lap.mark('career_groupby', rows=len(career_df))
+
+    # 4. Merge Correct Stats from Master Data
+    # We drop these columns if they exist in career_df to avoid duplication before merge
+    for c in ['centuries', 'fifties', 'sixes', 'fours', '5_wickets']:
+        if c in career_df.columns:
+            career_df.drop(columns=[c], inplace=True)
+            
+    if not master_subset.empty:
+        career_df = pd.merge(career_df, master_subset, on='name', how='left')
+        # Fill NaNs with 0 for players present in season data but not master data
+        career_df[['centuries', 'fifties', 'sixes', 'fours', '5_wickets']] = career_df[['centuries', 'fifties', 'sixes', 'fours', '5_wickets']].fillna(0)
+    else:
+        # Fallback if master_data isn't found
+        career_df['centuries'] = 0
+        career_df['fifties'] = 0
+        career_df['sixes'] = 0
+        career_df['fours'] = 0
+        career_df['5_wickets'] = 0
+
+    lap.mark('merge_master')
+
+    # Career Derived Metrics (incl. radar normalisation)
+    add_career_metrics(career_df)
+    lap.mark('career_metrics')
+
+    if compact:
+        df = compact_season_frame(df)
+        career_df = compact_career_frame(career_df)
+        lap.mark('compact')
+
+    lap.done()
+    return df, career_df
+
+def build_identity_frames():
+    try:
+        df = pd.read_csv(SEASON_CSV_PATH, usecols=lambda c: c == 'name' or is_identity_column(c), dtype=str)
+    except FileNotFoundError:
+        return (None,)
+    return (identity_table(df),)
+
+def build_ml_frames():
+    lap = Lap('load:ml')
+    try:
+        master_df = pd.read_csv(AUCTION_CSV_PATH)
+        stats_df = pd.read_csv(STATS_CSV_PATH)
+        lap.mark('read_csv', rows=len(master_df) + len(stats_df))
+        
+        master_df['Price'] = pd.to_numeric(master_df['Price'], errors='coerce').fillna(0)
+        master_df['Year'] = pd.to_numeric(master_df['Year'], errors='coerce')
+        master_df = master_df.dropna(subset=['Year'])
+        master_df = master_df[master_df['Price'] > 0]
+
+        stats_df['Year'] = pd.to_numeric(stats_df['Year'], errors='coerce')
+        stats_df = stats_df.dropna(subset=['Year'])
+        
+        cols_to_clean = ['Runs_Scored', 'Wickets_Taken', 'Batting_Strike_Rate',
+                        'Bowling_Average', 'Economy_Rate', 'Matches_Batted']
+        for col in cols_to_clean:
+            if col in stats_df.columns:
+                stats_df[col] = pd.to_numeric(
+                    stats_df[col].astype(str).str.replace(r'[^\d.]', '', regex=True),
+                    errors='coerce'
+                ).fillna(0)
+
+        lap.mark('clean')
+
+        master_df['join_name'] = master_df['Player'].str.lower().str.strip()
+        stats_df['join_name'] = stats_df['Player_Name'].str.lower().str.strip()
+
+        # Resolve both sources to Cricsheet identifiers; joins use player_key
+        try:
+            preferred = pd.read_csv(SEASON_CSV_PATH, usecols=['identifier'])['identifier'].dropna().unique()
+        except (FileNotFoundError, ValueError):
+            preferred = None
+        identity_map = load_identity_map({'auction': master_df['Player'], 'stats': stats_df['Player_Name']}, preferred)
+        attach_player_ids(master_df, 'Player', 'auction', identity_map)
+        attach_player_ids(stats_df, 'Player_Name', 'stats', identity_map)
+        lap.mark('identity')
+        lap.done()
+        
+        return master_df, stats_df
+        
+    except FileNotFoundError:
+        return None, None
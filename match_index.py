@@ -0,0 +1,140 @@
+import os
+import json
+from deliveries import clean_season
+
+# Match metadata (event, season, dates, match type) read without decoding
+# the ball-by-ball data, so generate.py can skip members of a mixed archive
+# before paying for a full json.load. Results are cached per zip member in
+# MATCH_INDEX_PATH, keyed by the member's CRC/size hash.
+
+MATCH_INDEX_PATH = 'match_index.json'
+INNINGS_KEY = b'"innings"'
+CHUNK_SIZE = 16 * 1024
+# Bumped when parsing changes so entries written by an older parser are
+# re-read rather than trusted
+INDEX_VERSION = 2
+
+
+def prefix_info(head):
+    # Cricsheet files put "meta" and "info" before "innings", so the bytes
+    # up to the "innings" key are a complete object once closed. None when
+    # that isn't the case (an earlier nested "innings", keys reordered) so the
+    # caller can fall back to a full parse.
+    head = head.rstrip().rstrip(b',')
+    try:
+        obj = json.loads(head + b'}')
+    except ValueError:
+        return None
+    return obj.get('info') if isinstance(obj, dict) and 'info' in obj else None
+
+
+def read_info(f, chunk_size=CHUNK_SIZE):
+    # -> (info, read_whole_file). Streams f until the "innings" key shows up,
+    # so the deliveries are normally never inflated; the rest is only read
+    # when the prefix doesn't hold the info block.
+    buf = bytearray()
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        # Re-scan the tail of the previous chunk in case the key straddles it
+        start = max(0, len(buf) - len(INNINGS_KEY) + 1)
+        buf += chunk
+        cut = buf.find(INNINGS_KEY, start)
+        if cut > 0:
+            info = prefix_info(bytes(buf[:cut]))
+            if info is not None:
+                return info, False
+            buf += f.read()
+            break
+    return json.loads(bytes(buf)).get('info', {}), True
+
+
+def match_metadata(info):
+    dates = info.get('dates') or ['']
+    return {
+        'event': (info.get('event') or {}).get('name', ''),
+        'season': clean_season(info.get('season', 'Unknown')),
+        'date': str(dates[0]),
+        'match_type': info.get('match_type', ''),
+    }
+
+
+class MatchFilter:
+    # All criteria optional; an empty filter accepts everything
+
+    def __init__(self, events=None, season_from=None, season_to=None,
+                 date_from=None, date_to=None, match_types=None):
+        self.events = [e.lower() for e in events or []]
+        self.season_from = season_from
+        self.season_to = season_to
+        self.date_from = date_from
+        self.date_to = date_to
+        self.match_types = {m.lower() for m in match_types or []}
+
+    def __bool__(self):
+        return bool(self.events or self.match_types or self.season_from or self.season_to
+                    or self.date_from or self.date_to)
+
+    def accepts(self, meta):
+        if self.events and not any(e in meta['event'].lower() for e in self.events):
+            return False
+        if self.match_types and meta['match_type'].lower() not in self.match_types:
+            return False
+        if self.season_from or self.season_to:
+            try:
+                season = int(meta['season'])
+            except ValueError:
+                return False
+            if self.season_from and season < self.season_from: return False
+            if self.season_to and season > self.season_to: return False
+        # ISO dates compare correctly as strings
+        if self.date_from and meta['date'] < self.date_from: return False
+        if self.date_to and meta['date'] > self.date_to: return False
+        return True
+
+
+def load_index(path=MATCH_INDEX_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_index(index, path=MATCH_INDEX_PATH):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(index, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp, path)
+
+
+def filter_members(z, match_hashes, match_filter, index=None):
+    # -> (accepted members, stats). index ({member: {'hash', ...metadata}})
+    # is updated in place for members that had to be read.
+    accepted = []
+    stats = {'index_hits': 0, 'prefix_reads': 0, 'full_reads': 0, 'unreadable': 0}
+    for member, h in match_hashes.items():
+        entry = index.get(member) if index is not None else None
+        if entry is not None and entry.get('hash') == h and entry.get('v') == INDEX_VERSION:
+            stats['index_hits'] += 1
+        else:
+            try:
+                with z.open(member) as f:
+                    info, whole = read_info(f)
+            except ValueError:
+                # Broken JSON is left for the main parse to count and skip
+                stats['unreadable'] += 1
+                accepted.append(member)
+                continue
+            stats['full_reads' if whole else 'prefix_reads'] += 1
+            entry = {'hash': h, 'v': INDEX_VERSION, **match_metadata(info)}
+            if index is not None:
+                index[member] = entry
+        if match_filter.accepts(entry):
+            accepted.append(member)
+
+    if index is not None:
+        for member in set(index) - set(match_hashes):
+            del index[member]
+    return accepted, stats
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from deliveries import BallArrays
+from metrics import safe_divide, strike_rate
+from player_index import GroupIndex
+
+# Batter-vs-bowler head-to-head totals. Only pairs that actually met are
+# stored (one row per batter, bowler, season), sorted so each batter's and
+# each bowler's rows can be pulled out as a block.
+
+MATCHUPS_PATH = 'matchups.parquet'
+MATCHUP_COLUMNS = ['balls', 'runs', 'dismissals', 'dots', 'boundaries']
+
+
+def build_matchups(tables, balls=None):
+    balls = BallArrays(tables) if balls is None else balls
+    n_players = balls.n_players
+    n_seasons = max(len(tables['seasons']), 1)
+
+    batter = balls.batter
+    key = (batter * n_players + balls.bowler) * n_seasons + balls.season
+    keys, at = np.unique(key, return_inverse=True)
+    n = len(keys)
+
+    runs, faced = balls.runs_batter, balls.faced
+
+    # Only the striker's dismissals credited to the bowler count against the pair
+    w_idx = balls.w_idx
+    credited = balls.bowler_wicket & (balls.w_out == batter[w_idx])
+
+    names = tables['players']['name'].to_numpy()
+    seasons = tables['seasons']['season'].to_numpy()
+    pair = keys // n_seasons
+    df = pd.DataFrame({
+        'batter': pd.Categorical(names[pair // n_players] if n else []),
+        'bowler': pd.Categorical(names[pair % n_players] if n else []),
+        'season': pd.Categorical(seasons[keys % n_seasons] if n else []),
+        'balls': np.bincount(at[faced], minlength=n),
+        'runs': np.bincount(at, runs, minlength=n),
+        'dismissals': np.bincount(at[w_idx[credited]], minlength=n),
+        'dots': np.bincount(at[faced & (runs == 0)], minlength=n),
+        'boundaries': np.bincount(at[(runs == 4) | (runs == 6)], minlength=n),
+    })
+    for col in MATCHUP_COLUMNS:
+        df[col] = df[col].astype(np.int32)
+    return df
+
+
+def save_matchups(df, path=MATCHUPS_PATH):
+    df.to_parquet(path, index=False)
+
+
+def load_matchups(path=MATCHUPS_PATH):
+    try:
+        return pd.read_parquet(path)
+    except FileNotFoundError:
+        return None
+
+
+def add_rates(df):
+    df['strike_rate'] = np.round(strike_rate(df['runs'], df['balls']), 2)
+    df['average'] = np.round(safe_divide(df['runs'], df['dismissals'], fallback=np.nan), 2)
+    df['dot_pct'] = np.round(safe_divide(df['dots'], df['balls']) * 100, 1)
+    return df
+
+
+class MatchupStore:
+
+    def __init__(self, df):
+        self.by_batter = GroupIndex(df, 'batter', sort_by='bowler')
+        self.by_bowler = GroupIndex(df, 'bowler', sort_by='batter')
+        self.batters = sorted(self.by_batter.keys)
+        self.bowlers = sorted(self.by_bowler.keys)
+        self.seasons = sorted(df['season'].astype(str).unique())
+
+    @staticmethod
+    def _in_seasons(rows, seasons):
+        return rows if not seasons else rows[rows['season'].astype(str).isin(seasons)]
+
+    def pair(self, batter, bowler, seasons=None):
+        # -> per-season rows for one pair (oldest first)
+        rows = self.by_batter.get(batter)
+        rows = self._in_seasons(rows[rows['bowler'] == bowler], seasons)
+        return add_rates(rows.sort_values('season', key=lambda s: s.astype(str)).reset_index(drop=True))
+
+    def opponents(self, player, role='batter', seasons=None, min_balls=0):
+        # -> one row per opponent, totals over the chosen seasons
+        index, other = (self.by_batter, 'bowler') if role == 'batter' else (self.by_bowler, 'batter')
+        rows = self._in_seasons(index.get(player), seasons)
+        totals = rows.groupby(other, observed=True, sort=False)[MATCHUP_COLUMNS].sum().reset_index()
+        totals[other] = totals[other].astype(str)
+        return add_rates(totals[totals['balls'] >= min_balls].reset_index(drop=True))
@@ -0,0 +1,65 @@
+import numpy as np
+
+# Derived player stats, computed on whole columns at once. Each function takes
+# Series or arrays and returns the same; a zero denominator gives the
+# fallback value instead of inf/NaN.
+
+RADAR_QUANTILE = 0.99
+ECONOMY_BEST = 5.0
+ECONOMY_WORST = 12.0
+
+
+def safe_divide(num, den, fallback=0.0):
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.broadcast_to(np.asarray(fallback, dtype=float), np.broadcast(num, den).shape).copy()
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def batting_average(runs, matches, not_outs=0):
+    # Falls back to plain runs when every appearance was a not out
+    return safe_divide(runs, np.asarray(matches) - np.asarray(not_outs), fallback=runs)
+
+
+def strike_rate(runs, balls_faced):
+    return safe_divide(runs, balls_faced) * 100
+
+
+def economy(runs_conceded, balls_bowled):
+    return safe_divide(runs_conceded, np.asarray(balls_bowled) / 6)
+
+
+def all_rounder_score(runs, wickets):
+    return runs + (wickets * 25)
+
+
+def normalise_by_quantile(values, q=RADAR_QUANTILE):
+    max_val = values.quantile(q)
+    if max_val == 0: max_val = 1
+    return (values / max_val).clip(0, 1)
+
+
+def normalise_economy(values, best=ECONOMY_BEST, worst=ECONOMY_WORST):
+    # Lower economy is better, so this one is inverted
+    return 1 - ((values - best) / (worst - best)).clip(0, 1)
+
+
+def add_season_metrics(df):
+    df['batting_avg'] = batting_average(df['runs_scored'], df['matches'], df['not_outs'])
+    df['batting_sr'] = strike_rate(df['runs_scored'], df['balls_faced'])
+    df['bowling_economy'] = economy(df['runs_conceded'], df['balls_bowled'])
+    return df
+
+
+def add_career_metrics(df):
+    df['batting_avg'] = np.round(batting_average(df['runs_scored'], df['matches']), 2)
+    df['batting_sr'] = np.round(strike_rate(df['runs_scored'], df['balls_faced']), 2)
+    df['bowling_economy'] = np.round(economy(df['runs_conceded'], df['balls_bowled']), 2)
+    df['all_rounder_score'] = all_rounder_score(df['runs_scored'], df['wickets'])
+
+    # Normalize for Radar
+    for col in ['batting_avg', 'batting_sr', 'runs_scored', 'wickets']:
+        df[f'norm_{col}'] = normalise_by_quantile(df[col])
+    df['norm_bowling_economy'] = normalise_economy(df['bowling_economy'])
+    return df
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# Lookup tables built once per data load so the views can fetch one player's
+# rows without scanning (and re-sorting) the full frame on every rerun.
+
+
+class GroupIndex:
+    # key -> contiguous block of rows, pre-sorted by sort_by within each key
+
+    def __init__(self, df, key, sort_by=None):
+        cols = [key] + ([sort_by] if sort_by else [])
+        self.frame = df.sort_values(cols, kind='stable').reset_index(drop=True)
+
+        values = self.frame[key].to_numpy()
+        if len(values):
+            starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+            stops = np.r_[starts[1:], len(values)]
+        else:
+            starts = stops = np.array([], dtype=int)
+        self._slices = {values[a]: (a, b) for a, b in zip(starts, stops)}
+        self.keys = [k for k in self._slices if not pd.isna(k)]
+
+    def __contains__(self, key):
+        return key in self._slices
+
+    def __len__(self):
+        return len(self._slices)
+
+    def get(self, key):
+        start, stop = self._slices.get(key, (0, 0))
+        return self.frame.iloc[start:stop]
+
+    def first(self, key):
+        start, stop = self._slices[key]
+        return self.frame.iloc[start]
+
+
+class PlayerStore:
+    # Everything the Player 360° view needs for one player: career row and
+    # season-by-season slice
+
+    def __init__(self, season_df, career_df):
+        self.career = GroupIndex(career_df, 'name')
+        self.seasons = GroupIndex(season_df, 'name', sort_by='season')
+        self.names = self.career.keys
+
+    def career_row(self, name):
+        return self.career.first(name)
+
+    def season_rows(self, name):
+        return self.seasons.get(name)
+
+
+class AuctionStore:
+    # Stats and auction history for the ML view, both ordered by Year.
+    # Auctions are matched on player_key (resolved identifier), not name.
+
+    def __init__(self, df_master, df_stats):
+        self.stats = GroupIndex(df_stats, 'Player_Name', sort_by='Year')
+        self.auctions = GroupIndex(df_master, 'player_key', sort_by='Year')
+        self.names = self.stats.keys
+        self.player_keys = dict(zip(df_stats['Player_Name'], df_stats['player_key']))
+
+    def stat_rows(self, name):
+        return self.stats.get(name)
+
+    def auction_rows(self, name):
+        return self.auctions.get(self.player_keys.get(name))
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+# Lightweight timers and counters for the pipeline and the app.
+#
+#   with stage('load:read_csv', rows=len(df)): ...     # one timed block
+#   lap = Lap('render:hall_of_fame'); ...; lap.mark('charts'); lap.done()
+#   count('matches_parsed', n)
+#   log_counters('ingest:counters')                     # counter snapshot
+#
+# Stages are kept per thread for the current run, which is what the app's
+# sidebar performance panel shows; counters are process-wide. The JSON-lines
+# log is opt-in: set IPL_PERF_LOG=perf_log.jsonl (or any path) and every
+# finished stage, and every log_counters() snapshot, is appended to it as
+# one line.
+
+PERF_LOG_PATH = os.environ.get('IPL_PERF_LOG', '')
+
+_lock = threading.Lock()
+_counters = {}
+_local = threading.local()
+
+
+def _run_stages():
+    if not hasattr(_local, 'stages'):
+        _local.stages = []
+    return _local.stages
+
+
+def begin_run(label=None):
+    # Starts a fresh per-thread list of stages (one Streamlit rerun, one CLI run)
+    _local.stages = []
+    _local.label = label
+
+
+def run_stages():
+    return list(_run_stages())
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def record(name, seconds, **fields):
+    event = {'ts': round(time.time(), 3), 'stage': name, 'seconds': round(seconds, 6),
+             'pid': os.getpid(), **fields}
+    label = getattr(_local, 'label', None)
+    if label is not None:
+        event['run'] = label
+    _run_stages().append(event)
+
+    if PERF_LOG_PATH:
+        line = json.dumps(event, default=str)
+        with _lock:
+            with open(PERF_LOG_PATH, 'a') as f:
+                f.write(line + '\n')
+    return event
+
+
+@contextmanager
+def stage(name, **fields):
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        # Callers may add fields (e.g. row counts) to the yielded dict
+        record(name, time.perf_counter() - start, **fields)
+
+
+class Lap:
+    # Splits one long block (like a view render) into consecutive stages
+    # without re-indenting it: each mark() records the time since the last one
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.start = self.last = time.perf_counter()
+
+    def mark(self, name, **fields):
+        now = time.perf_counter()
+        record(f'{self.prefix}:{name}', now - self.last, **fields)
+        self.last = now
+
+    def done(self, **fields):
+        record(self.prefix, time.perf_counter() - self.start, **fields)
+
+
+def track_cache(cache_decorator):
+    # Wraps a Streamlit cache decorator (st.cache_data / st.cache_resource)
+    # so calls and actual executions are counted: misses are the calls that
+    # reached the function body, hits are the rest
+    def decorator(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def fill(*args, **kwargs):
+            count(f'cache_miss:{name}')
+            with stage(f'cache_fill:{name}'):
+                return fn(*args, **kwargs)
+
+        cached = cache_decorator(fill)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            count(f'cache_call:{name}')
+            return cached(*args, **kwargs)
+
+        call.clear = cached.clear
+        return call
+    return decorator
+
+
+def log_counters(name, **fields):
+    # One event holding the process's counters so far (cache hits/misses
+    # included), so they reach the log alongside the stages
+    snapshot = counters()
+    if not snapshot:
+        return None
+    stats = cache_stats()
+    if stats:
+        fields['cache'] = {fn: dict(zip(['calls', 'hits', 'misses'], v)) for fn, v in stats.items()}
+    return record(name, 0.0, counters=snapshot, **fields)
+
+
+def cache_stats():
+    # -> {function: (calls, hits, misses)}
+    snapshot = counters()
+    stats = {}
+    for key, calls in snapshot.items():
+        if key.startswith('cache_call:'):
+            name = key.split(':', 1)[1]
+            misses = snapshot.get(f'cache_miss:{name}', 0)
+            stats[name] = (calls, calls - misses, misses)
+    return stats
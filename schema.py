@@ -0,0 +1,67 @@
+import numpy as np
+
+# Compact in-memory layout for the dashboard frames. Every app replica keeps
+# these frames resident, so names/seasons are categoricals, counters use the
+# narrowest integer type that holds them, and the mostly-empty people.csv
+# identity columns live in a separate table that is only loaded on demand.
+
+IDENTITY_COLUMNS = [
+    'identifier', 'unique_name', 'key_bcci', 'key_bcci_2', 'key_bigbash', 'key_cricbuzz',
+    'key_cricheroes', 'key_crichq', 'key_cricinfo', 'key_cricinfo_2', 'key_cricinfo_3',
+    'key_cricingif', 'key_cricketarchive', 'key_cricketarchive_2', 'key_cricketworld',
+    'key_nvplay', 'key_nvplay_2', 'key_opta', 'key_opta_2', 'key_pulse', 'key_pulse_2'
+]
+
+# Per-season counts stay well inside int16; anything that sums across
+# seasons or counts runs/balls gets int32
+SEASON_INT16_COLUMNS = [
+    'matches', 'innings_batted', 'fours', 'sixes', 'not_outs', 'high_score', 'centuries',
+    'fifties', 'innings_bowled', 'wickets', 'catches', 'stumpings'
+]
+SEASON_INT32_COLUMNS = ['runs_scored', 'balls_faced', 'balls_bowled', 'runs_conceded']
+CAREER_INT32_COLUMNS = [
+    'matches', 'runs_scored', 'balls_faced', 'wickets', 'balls_bowled', 'runs_conceded',
+    'catches', 'centuries', 'fifties', 'sixes', 'fours', '5_wickets', 'all_rounder_score'
+]
+
+
+def is_identity_column(col):
+    return col in IDENTITY_COLUMNS
+
+
+def downcast(series, dtype):
+    # Only narrows when every value fits; otherwise the column is left alone
+    if series.isna().any():
+        return series
+    info = np.iinfo(dtype)
+    if len(series) and (series.min() < info.min or series.max() > info.max):
+        return series
+    return series.astype(dtype)
+
+
+def compact_season_frame(df):
+    df = df.drop(columns=[c for c in df.columns if is_identity_column(c)])
+    for col in SEASON_INT16_COLUMNS:
+        if col in df: df[col] = downcast(df[col], np.int16)
+    for col in SEASON_INT32_COLUMNS:
+        if col in df: df[col] = downcast(df[col], np.int32)
+    df['name'] = df['name'].astype('category')
+    df['season'] = df['season'].astype('category')
+    return df
+
+
+def compact_career_frame(df):
+    # One row per player, so the name stays a plain string column
+    for col in CAREER_INT32_COLUMNS:
+        if col in df: df[col] = downcast(df[col], np.int32)
+    return df
+
+
+def identity_table(df):
+    # name -> identifier / provider keys, one row per distinct combination
+    cols = ['name'] + [c for c in IDENTITY_COLUMNS if c in df.columns]
+    return df[cols].dropna(subset=['identifier']).drop_duplicates().reset_index(drop=True)
+
+
+def memory_footprint(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from metrics import batting_average, strike_rate, economy, normalise_by_quantile, normalise_economy
+from leaderboard import top_k
+
+# "Players most like X" over the radar's normalised skill vectors. The
+# feature matrix is built once per data load; a query is one matrix-vector
+# product plus an argpartition, so it stays in the low milliseconds even at
+# people.csv scale.
+
+SKILL_COLUMNS = ['norm_batting_avg', 'norm_batting_sr', 'norm_runs_scored', 'norm_wickets', 'norm_bowling_economy']
+SIMILARITY_METRICS = ['cosine', 'euclidean']
+
+
+def season_skill_frame(season_df):
+    # Per-season equivalents of the career radar columns, normalised across
+    # all player-seasons
+    df = pd.DataFrame({'name': season_df['name'].astype(str).to_numpy(),
+                       'season': season_df['season'].astype(str).to_numpy()})
+    df['batting_avg'] = batting_average(season_df['runs_scored'], season_df['matches'])
+    df['batting_sr'] = strike_rate(season_df['runs_scored'], season_df['balls_faced'])
+    df['runs_scored'] = season_df['runs_scored'].to_numpy()
+    df['wickets'] = season_df['wickets'].to_numpy()
+    df['bowling_economy'] = economy(season_df['runs_conceded'], season_df['balls_bowled'])
+    for col in ['batting_avg', 'batting_sr', 'runs_scored', 'wickets']:
+        df[f'norm_{col}'] = normalise_by_quantile(df[col])
+    df['norm_bowling_economy'] = normalise_economy(df['bowling_economy'])
+    return df
+
+
+class SimilarityIndex:
+    # Rows are identified by `keys` (player name, or (name, season) for the
+    # per-season index)
+
+    def __init__(self, df, keys, features=SKILL_COLUMNS):
+        self.frame = df.reset_index(drop=True)
+        self.keys = list(keys)
+        self._pos = {k: i for i, k in enumerate(self.keys)}
+        self.vectors = np.ascontiguousarray(self.frame[features].to_numpy(np.float32))
+        norms = np.linalg.norm(self.vectors, axis=1)
+        self.unit = self.vectors / np.where(norms > 0, norms, 1)[:, None]
+        self._sq_norms = (self.vectors ** 2).sum(axis=1)
+
+    @classmethod
+    def for_careers(cls, career_df):
+        return cls(career_df, career_df['name'].astype(str))
+
+    @classmethod
+    def for_seasons(cls, season_df):
+        df = season_skill_frame(season_df)
+        return cls(df, zip(df['name'], df['season']))
+
+    def __contains__(self, key):
+        return key in self._pos
+
+    def scores(self, key, metric='cosine'):
+        # Higher is more similar for both metrics (euclidean is negated distance)
+        i = self._pos[key]
+        if metric == 'cosine':
+            return self.unit @ self.unit[i]
+        sq = self._sq_norms + self._sq_norms[i] - 2 * (self.vectors @ self.vectors[i])
+        return -np.sqrt(np.maximum(sq, 0))
+
+    def most_similar(self, key, k=10, metric='cosine', eligible=None):
+        # -> frame rows of the k nearest neighbours (excluding key itself)
+        # with a `similarity` column; eligible is an optional boolean mask
+        scores = self.scores(key, metric)
+        mask = np.ones(len(self.keys), dtype=bool) if eligible is None else np.asarray(eligible, dtype=bool).copy()
+        mask[self._pos[key]] = False
+        idx = top_k(scores, k, eligible=mask)
+        out = self.frame.iloc[idx].copy()
+        out.insert(0, 'similarity', scores[idx])
+        return out.reset_index(drop=True)
+
+
+def latest_prices(df_master, identity):
+    # Latest auction price per Cricsheet name, joined on the resolved
+    # identifier; names without a resolved auction record are left out
+    auctions = df_master.dropna(subset=['player_id']).sort_values('Year', kind='stable')
+    last = auctions.groupby('player_id')['Price'].last()
+    ids = identity.dropna(subset=['identifier']).drop_duplicates('name')
+    prices = ids.set_index('name')['identifier'].map(last).dropna()
+    return prices
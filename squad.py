@@ -0,0 +1,239 @@
+import time
+import numpy as np
+import pandas as pd
+
+# Auction squad optimiser: pick the set of players that maximises total
+# performance score within the purse, with an exact squad size, minimum
+# counts per valuation role and a cap on overseas players.
+#
+# Exact branch-and-bound. The bound relaxes the purse and overseas cap with
+# Lagrange multipliers, which leaves "best k players with per-role minimums"
+# -- solvable greedily with argpartition. The multipliers are re-tuned by
+# bisection on every solve (a few ms); a live auction (record_sale) reuses
+# the previous squad, topped up greedily, as the starting incumbent.
+# tests/test_squad.py cross-checks the solver against brute force.
+
+ROLES = ['Batter', 'Bowler', 'All-Rounder']
+DEFAULT_PURSE = 1200000000.0        # ₹120 Cr
+DEFAULT_SQUAD_SIZE = 18
+DEFAULT_ROLE_MINIMUMS = {'Batter': 5, 'Bowler': 5, 'All-Rounder': 3}
+DEFAULT_OVERSEAS_CAP = 8
+PRICE_UNIT = 10000000.0             # the solver works in crore
+BISECTION_STEPS = 30
+
+
+def _best_k(values, roles, needs, k):
+    # Max total of exactly k values with at least needs[r] from each role;
+    # -inf when that's impossible
+    if k < 0 or sum(needs) > k:
+        return -np.inf
+    if k == 0:
+        return 0.0
+    total = 0.0
+    taken = np.zeros(len(values), dtype=bool)
+    for r, need in enumerate(needs):
+        if need <= 0: continue
+        idx = np.flatnonzero(roles == r)
+        if len(idx) < need:
+            return -np.inf
+        top = idx[np.argpartition(-values[idx], need - 1)[:need]]
+        total += values[top].sum()
+        taken[top] = True
+    rest = k - sum(max(n, 0) for n in needs)
+    if rest:
+        free = values[~taken]
+        if len(free) < rest:
+            return -np.inf
+        total += np.partition(free, len(free) - rest)[len(free) - rest:].sum()
+    return total
+
+
+def _inner_choice(values, roles, needs, k):
+    # Same selection as _best_k, returning the chosen mask (for subgradients)
+    chosen = np.zeros(len(values), dtype=bool)
+    for r, need in enumerate(needs):
+        if need <= 0: continue
+        idx = np.flatnonzero(roles == r)
+        top = idx[np.argsort(-values[idx], kind='stable')[:need]]
+        chosen[top] = True
+    rest = k - chosen.sum()
+    if rest > 0:
+        free = np.flatnonzero(~chosen)
+        chosen[free[np.argsort(-values[free], kind='stable')[:rest]]] = True
+    return chosen
+
+
+class SquadOptimizer:
+
+    def __init__(self, candidates, purse=DEFAULT_PURSE, squad_size=DEFAULT_SQUAD_SIZE,
+                 role_minimums=None, overseas_cap=DEFAULT_OVERSEAS_CAP, time_limit=2.0):
+        # candidates: name, role, price, perf_score, and optionally overseas (bool)
+        pool = candidates[candidates['role'].isin(ROLES)].drop_duplicates('name').reset_index(drop=True)
+        if 'overseas' not in pool:
+            pool['overseas'] = False
+        self.pool = pool
+        self.available = np.ones(len(pool), dtype=bool)
+        self.purse = purse
+        self.squad_size = squad_size
+        self.role_minimums = dict(DEFAULT_ROLE_MINIMUMS if role_minimums is None else role_minimums)
+        self.overseas_cap = overseas_cap
+        self.time_limit = time_limit
+        self.signed = []                # (pool row, price paid)
+        self.sales = []
+        self.multipliers = None
+        self.plan = None                # pool rows of the last solution
+
+        self._score = pool['perf_score'].to_numpy(float)
+        self._price = pool['price'].to_numpy(float) / PRICE_UNIT
+        self._role = pool['role'].map({r: i for i, r in enumerate(ROLES)}).to_numpy()
+        self._overseas = pool['overseas'].to_numpy(bool).astype(float)
+
+    # --- constraints left after the players already signed ---
+    def _remaining(self):
+        signed = [row for row, _ in self.signed]
+        spent = sum(paid for _, paid in self.signed) / PRICE_UNIT
+        slots = self.squad_size - len(signed)
+        needs = [max(0, self.role_minimums.get(r, 0) - sum(self._role[s] == i for s in signed))
+                 for i, r in enumerate(ROLES)]
+        overseas = self.overseas_cap - int(sum(self._overseas[s] for s in signed))
+        return self.purse / PRICE_UNIT - spent, slots, needs, overseas
+
+    def _tune_multipliers(self, idx, budget, slots, needs, ov_cap):
+        # Minimise the Lagrangian dual over (purse, overseas) multipliers. The
+        # chosen squad's cost only falls as the purse multiplier rises (same
+        # for overseas count), so each is found by bisection on the sign of
+        # its slack: purse inside, overseas outside
+        s, p, o, r = self._score[idx], self._price[idx], self._overseas[idx], self._role[idx]
+        if slots <= 0 or not len(idx):
+            return 0.0, 0.0
+        spread = max(np.ptp(s), 1.0)
+
+        def fit_lambda(mu):
+            lo, hi = 0.0, spread / max(np.min(p[p > 0], initial=1.0), 1e-3)
+            chosen = _inner_choice(s - mu * o, r, needs, slots)
+            if p[chosen].sum() <= budget:
+                return 0.0, chosen
+            for _ in range(BISECTION_STEPS):
+                lam = (lo + hi) / 2
+                chosen = _inner_choice(s - lam * p - mu * o, r, needs, slots)
+                if p[chosen].sum() > budget: lo = lam
+                else: hi = lam
+            return hi, _inner_choice(s - hi * p - mu * o, r, needs, slots)
+
+        lam, chosen = fit_lambda(0.0)
+        if o[chosen].sum() <= ov_cap:
+            return float(lam), 0.0
+        lo, hi = 0.0, spread
+        for _ in range(BISECTION_STEPS // 2):
+            mu = (lo + hi) / 2
+            _, chosen = fit_lambda(mu)
+            if o[chosen].sum() > ov_cap: lo = mu
+            else: hi = mu
+        return float(fit_lambda(hi)[0]), float(hi)
+
+    def solve(self):
+        start = time.perf_counter()
+        budget, slots, needs, ov_cap = self._remaining()
+        idx = np.flatnonzero(self.available)
+
+        # Re-tuned every time: after a signing the purse and needs move, and
+        # stale multipliers give a much weaker bound. It's a few ms.
+        self.multipliers = lam, mu = self._tune_multipliers(idx, budget, slots, needs, ov_cap)
+
+        # Candidates in order of Lagrangian value, so good squads come first
+        values_all = self._score - lam * self._price - mu * self._overseas
+        idx = idx[np.argsort(-values_all[idx], kind='stable')]
+        s, p, o, r, v = (self._score[idx], self._price[idx], self._overseas[idx],
+                         self._role[idx], values_all[idx])
+        n = len(idx)
+
+        best_score, best_set, warm = -np.inf, None, False
+        # The previous plan minus anyone no longer available, topped up
+        # greedily, is a ready-made incumbent when it still fits
+        if self.plan is not None:
+            pos = {row: i for i, row in enumerate(idx)}
+            keep = [pos[row] for row in self.plan if row in pos]
+            for j in range(n):
+                if len(keep) >= slots: break
+                if j not in keep and p[keep].sum() + p[j] <= budget and o[keep].sum() + o[j] <= ov_cap:
+                    keep.append(j)
+            if len(keep) == slots and self._fits(keep, s, p, o, r, budget, needs, ov_cap):
+                best_score, best_set, warm = s[keep].sum(), list(keep), True
+
+        nodes = 0
+        deadline = start + self.time_limit
+        timed_out = False
+        chosen = []
+
+        def expand(i, k, cost, ov, needs_left, score):
+            nonlocal best_score, best_set, nodes, timed_out
+            if k == 0:
+                if score > best_score + 1e-9 and not any(needs_left):
+                    best_score, best_set = score, list(chosen)
+                return
+            for j in range(i, n):
+                nodes += 1
+                if nodes % 512 == 0 and time.perf_counter() > deadline:
+                    timed_out = True
+                if timed_out:
+                    return
+                # Bound for every squad that takes its next player from j onwards;
+                # it only shrinks as j moves right, so the loop can stop here
+                inner = _best_k(v[j:], r[j:], needs_left, k)
+                if inner == -np.inf:
+                    return
+                # Likewise, the k cheapest players left have to fit the purse
+                if cost + np.partition(p[j:], k - 1)[:k].sum() > budget + 1e-9:
+                    return
+                if score + lam * (budget - cost) + mu * (ov_cap - ov) + inner <= best_score + 1e-9:
+                    return
+                if cost + p[j] > budget + 1e-9 or ov + o[j] > ov_cap:
+                    continue
+                chosen.append(j)
+                new_needs = list(needs_left)
+                new_needs[r[j]] = max(0, new_needs[r[j]] - 1)
+                expand(j + 1, k - 1, cost + p[j], ov + o[j], new_needs, score + s[j])
+                chosen.pop()
+
+        if slots > 0 and n:
+            expand(0, slots, 0.0, 0.0, list(needs), 0.0)
+        elif slots == 0:
+            best_score, best_set = 0.0, []
+
+        self.plan = None if best_set is None else [idx[i] for i in best_set]
+        return self._result(best_score, not timed_out, nodes, time.perf_counter() - start, warm)
+
+    @staticmethod
+    def _fits(rows, s, p, o, r, budget, needs, ov_cap):
+        if p[rows].sum() > budget + 1e-9 or o[rows].sum() > ov_cap:
+            return False
+        return all(np.sum(r[rows] == i) >= need for i, need in enumerate(needs))
+
+    def _result(self, score, optimal, nodes, seconds, warm):
+        signed = self.pool.loc[[row for row, _ in self.signed]].assign(
+            price=[paid for _, paid in self.signed], status='Signed')
+        planned = self.pool.loc[self.plan or []].assign(status='Target')
+        squad = pd.concat([signed, planned], ignore_index=True)
+        return {
+            'squad': squad,
+            'feasible': self.plan is not None,
+            'total_score': float(squad['perf_score'].sum()) if self.plan is not None else None,
+            'total_price': float(squad['price'].sum()) if self.plan is not None else None,
+            'optimal': optimal,
+            'nodes': nodes,
+            'seconds': seconds,
+            'warm_start': warm,
+        }
+
+    def record_sale(self, name, price, to_us=False):
+        # A player went under the hammer: they leave the pool either way, and
+        # if we bought them they take a squad slot and part of the purse
+        rows = np.flatnonzero((self.pool['name'] == name).to_numpy() & self.available)
+        if not len(rows):
+            raise KeyError(name)
+        row = rows[0]
+        self.available[row] = False
+        if to_us:
+            self.signed.append((row, float(price)))
+        self.sales.append({'name': name, 'price': float(price), 'to_us': to_us})
+        return self.solve()
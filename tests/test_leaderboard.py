@@ -0,0 +1,30 @@
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from leaderboard import top_k
+
+
+def reference(values, k, ascending=False, eligible=None):
+    idx = range(len(values)) if eligible is None else np.flatnonzero(eligible)
+    return sorted(idx, key=lambda i: (values[i] if ascending else -values[i], i))[:k]
+
+
+def test_ties_at_the_cut_keep_index_order():
+    # Ten rows level on 5 for the last three places
+    values = np.array([9.0] + [5.0] * 10 + [7.0])
+    assert top_k(values, 4).tolist() == [0, 11, 1, 2]
+    assert top_k(-values, 4, ascending=True).tolist() == [0, 11, 1, 2]
+
+
+def test_matches_full_sort():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        n = int(rng.integers(1, 60))
+        values = rng.integers(0, 5, n).astype(float)
+        k, ascending = int(rng.integers(1, n + 3)), bool(rng.random() < 0.5)
+        eligible = rng.random(n) < 0.8
+        assert top_k(values, k, ascending, eligible).tolist() == reference(values, k, ascending, eligible)
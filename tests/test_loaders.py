@@ -0,0 +1,53 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import loaders
+
+# season_data.csv repeats Rashid Khan's season rows once per people.csv
+# profile with his name (four of them), and master_data.csv repeats his row
+# the same way. The dashboard frames should count each season once.
+PLAYER = 'Rashid Khan'
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    season = pd.read_csv(os.path.join(ROOT, 'season_data.csv'))
+    master = pd.read_csv(os.path.join(ROOT, 'master_data.csv'))
+    season, master = season[season['name'] == PLAYER], master[master['name'] == PLAYER]
+    season.to_csv(tmp_path / 'season_data.csv', index=False)
+    master.to_csv(tmp_path / 'master_data.csv', index=False)
+    monkeypatch.setattr(loaders, 'SEASON_CSV_PATH', str(tmp_path / 'season_data.csv'))
+    monkeypatch.setattr(loaders, 'MASTER_CSV_PATH', str(tmp_path / 'master_data.csv'))
+    return season, master
+
+
+def test_sources_repeat_rows(sources):
+    season, master = sources
+    assert len(season) == 4 * season['season'].nunique()
+    assert len(master) == 4
+
+
+def test_one_row_per_season_and_career(sources):
+    season, _ = sources
+    season_df, career_df = loaders.build_dashboard_frames()
+    assert len(season_df) == season['season'].nunique()
+    assert not season_df.duplicated(['name', 'season']).any()
+    assert career_df['name'].tolist() == [PLAYER]
+
+
+def test_career_totals_count_each_season_once(sources):
+    season, master = sources
+    _, career_df = loaders.build_dashboard_frames()
+    unique = season.drop_duplicates(['name', 'season'])
+    career = career_df.iloc[0]
+    for col in ['matches', 'runs_scored', 'balls_faced', 'wickets', 'balls_bowled', 'runs_conceded', 'catches']:
+        assert career[col] == unique[col].sum(), col
+    # e.g. 14 + 17 + ... matches, not four times that
+    assert career['matches'] < season['matches'].sum()
+    for col in ['centuries', 'fifties', 'sixes', 'fours', '5_wickets']:
+        assert career[col] == master[col].iloc[0], col
@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import sys
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import match_index
+from match_index import INDEX_VERSION, MatchFilter, filter_members, read_info
+
+INFO = {
+    'event': {'name': 'Indian Premier League'},
+    'season': '2008',
+    'dates': ['2008-04-18'],
+    'match_type': 'T20',
+}
+INNINGS = [{'team': 'A', 'overs': [{'over': 0, 'deliveries': [{'batter': 'x', 'runs': {'total': 1}}]}]}]
+IPL_2008 = MatchFilter(events=['premier'], season_from=2008, match_types=['t20'])
+
+
+def encode(pairs):
+    # Keeps key order, which json.dumps of a dict literal would too, but
+    # makes the layout under test explicit
+    return ('{' + ','.join(f'{json.dumps(k)}:{json.dumps(v)}' for k, v in pairs) + '}').encode()
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        out = super().read(size)
+        self.bytes_read += len(out)
+        return out
+
+
+def test_standard_layout_reads_only_the_prefix():
+    raw = encode([('meta', {'revision': 1}), ('info', INFO), ('innings', INNINGS * 2000)])
+    f = CountingReader(raw)
+    info, whole = read_info(f, chunk_size=64)
+    assert info == INFO and not whole
+    assert f.bytes_read < len(raw) // 10
+
+
+def test_key_split_across_chunks():
+    raw = encode([('meta', {}), ('info', INFO), ('innings', INNINGS)])
+    cut = raw.find(b'"innings"')
+    for size in range(cut - 8, cut + 9):
+        info, whole = read_info(io.BytesIO(raw), chunk_size=max(size, 1))
+        assert info == INFO and not whole, size
+
+
+def test_innings_before_info_falls_back_to_full_parse():
+    raw = encode([('meta', {}), ('innings', INNINGS), ('info', INFO)])
+    info, whole = read_info(io.BytesIO(raw), chunk_size=16)
+    assert info == INFO and whole
+
+
+def test_earlier_innings_key_falls_back():
+    # An "innings" key nested inside meta cuts the prefix mid-object
+    raw = encode([('meta', {'innings': 2}), ('info', INFO), ('innings', INNINGS)])
+    info, whole = read_info(io.BytesIO(raw))
+    assert info == INFO and whole
+
+
+def test_filter_keeps_reordered_match_and_indexes_it(tmp_path):
+    path = tmp_path / 'all.zip'
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr('1.json', encode([('innings', INNINGS), ('info', INFO)]))
+        z.writestr('2.json', encode([('info', {**INFO, 'season': '2007'}), ('innings', INNINGS)]))
+    hashes = {'1.json': 'a', '2.json': 'b'}
+    index = {}
+    with zipfile.ZipFile(path) as z:
+        accepted, stats = filter_members(z, hashes, IPL_2008, index)
+    assert accepted == ['1.json']
+    assert stats['full_reads'] == 1 and stats['prefix_reads'] == 1
+    assert index['1.json']['season'] == '2008'
+    assert index['1.json']['v'] == INDEX_VERSION
+
+
+def test_entries_from_an_older_parser_are_reread(tmp_path):
+    path = tmp_path / 'all.zip'
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr('1.json', encode([('innings', INNINGS), ('info', INFO)]))
+    # What the previous parser cached for a reordered file
+    index = {'1.json': {'hash': 'a', 'event': '', 'season': 'Unknown', 'date': '', 'match_type': ''}}
+    with zipfile.ZipFile(path) as z:
+        accepted, stats = filter_members(z, {'1.json': 'a'}, IPL_2008, index)
+    assert accepted == ['1.json'] and stats['index_hits'] == 0
+    match_index.save_index(index, str(tmp_path / 'index.json'))
+    with zipfile.ZipFile(path) as z:
+        _, stats = filter_members(z, {'1.json': 'a'}, IPL_2008, match_index.load_index(str(tmp_path / 'index.json')))
+    assert stats['index_hits'] == 1
@@ -0,0 +1,102 @@
+import os
+import sys
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from squad import SquadOptimizer, ROLES, PRICE_UNIT
+
+# SquadOptimizer against brute force: a hand-built auction with known optima,
+# then small seeded random auctions (random role minimums, overseas cap and
+# purse, plus one record_sale() each for the re-optimised squad).
+
+POOL = pd.DataFrame({
+    'name': ['A', 'B', 'C', 'D', 'E', 'F', 'G'],
+    'role': ['Batter', 'Batter', 'Bowler', 'Bowler', 'All-Rounder', 'All-Rounder', 'Batter'],
+    'price': np.array([6, 2, 4, 1, 3, 2, 5]) * PRICE_UNIT,
+    'perf_score': [90.0, 50.0, 70.0, 30.0, 60.0, 45.0, 80.0],
+    'overseas': [True, False, True, False, False, True, True],
+})
+MINIMUMS = {'Batter': 1, 'Bowler': 1, 'All-Rounder': 1}
+
+
+def brute_force(pool, signed, squad_size, purse, role_minimums, overseas_cap):
+    # Best total perf_score over every squad_size-subset of pool, on top of the
+    # already signed rows (with their prices paid); None when nothing fits
+    best = None
+    for combo in itertools.combinations(range(len(pool)), squad_size - len(signed)):
+        squad = pd.concat([signed, pool.iloc[list(combo)]])
+        if squad['price'].sum() > purse or squad['overseas'].sum() > overseas_cap:
+            continue
+        if any((squad['role'] == r).sum() < m for r, m in role_minimums.items()):
+            continue
+        score = squad['perf_score'].sum()
+        best = score if best is None or score > best else best
+    return best
+
+
+@pytest.mark.parametrize('purse, squad_size, overseas_cap, expected', [
+    # A, C, E: the three best that cover every role
+    (13, 3, 3, 220.0),
+    # A and C no longer fit together: B, C, E (50 + 70 + 60)
+    (10, 3, 3, 180.0),
+    # one overseas player: C, with B and E
+    (13, 3, 1, 180.0),
+    # four slots for 12 Cr: A, B, D, E, which leaves C and G out
+    (12, 4, 2, 230.0),
+    # the cheapest batter, bowler and all-rounder cost 5 Cr
+    (3, 3, 3, None),
+])
+def test_known_optima(purse, squad_size, overseas_cap, expected):
+    opt = SquadOptimizer(POOL, purse=purse * PRICE_UNIT, squad_size=squad_size,
+                         role_minimums=MINIMUMS, overseas_cap=overseas_cap)
+    result = opt.solve()
+    assert result['total_score'] == expected
+    assert result['feasible'] == (expected is not None)
+    assert expected == brute_force(POOL, POOL.iloc[:0], squad_size, purse * PRICE_UNIT, MINIMUMS, overseas_cap)
+    if expected is not None:
+        assert result['optimal']
+        assert result['total_price'] <= purse * PRICE_UNIT
+
+
+def test_record_sale_reoptimises():
+    opt = SquadOptimizer(POOL, purse=13 * PRICE_UNIT, squad_size=3, role_minimums=MINIMUMS, overseas_cap=3)
+    assert opt.solve()['total_score'] == 220.0
+    # A goes elsewhere: G takes the batting slot
+    assert opt.record_sale('A', 6 * PRICE_UNIT)['total_score'] == 210.0
+    # We overpay for C, leaving 5 Cr for a batter and an all-rounder
+    result = opt.record_sale('C', 8 * PRICE_UNIT, to_us=True)
+    assert result['total_score'] == 180.0
+    assert set(result['squad']['name']) == {'C', 'B', 'E'}
+    with pytest.raises(KeyError):
+        opt.record_sale('A', PRICE_UNIT)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n, k = int(rng.integers(8, 13)), int(rng.integers(3, 6))
+    df = pd.DataFrame({'name': [f'p{j}' for j in range(n)], 'role': rng.choice(ROLES, n),
+                       'price': rng.integers(1, 40, n) * 5e6, 'perf_score': rng.random(n) * 100,
+                       'overseas': rng.random(n) < 0.4})
+    role_minimums = {r: int(rng.integers(0, 3)) for r in ROLES}
+    overseas_cap, purse = int(rng.integers(0, 4)), float(rng.integers(5, 60)) * 1e7
+
+    opt = SquadOptimizer(df, purse=purse, squad_size=k, role_minimums=role_minimums, overseas_cap=overseas_cap)
+    got = opt.solve()['total_score']
+    expected = brute_force(df, df.iloc[:0], k, purse, role_minimums, overseas_cap)
+    assert got == pytest.approx(expected) if expected is not None else got is None
+    if got is None:
+        return
+
+    # One player goes under the hammer, to us or to another team
+    name = df['name'].iloc[rng.integers(n)]
+    to_us, paid = bool(rng.random() < 0.5), float(rng.integers(1, 40)) * 5e6
+    got = opt.record_sale(name, paid, to_us)['total_score']
+    signed = df[df['name'] == name].assign(price=paid) if to_us else df.iloc[:0]
+    expected = brute_force(df[df['name'] != name], signed, k, purse, role_minimums, overseas_cap)
+    assert got == pytest.approx(expected) if expected is not None else got is None
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+# Auction valuation model. calculate_valuation prices one stat line (the
+# What-If sliders); batch_valuation applies the same rules to whole arrays.
+
+IDEAL_BAT_RUNS = 973.0
+IDEAL_BOWL_WKTS = 32.0
+IDEAL_AR_RUNS = 510.0
+IDEAL_AR_WKTS = 11.0
+MAX_PRICE_CAP = 210000000.0
+
+def calculate_valuation(runs, wickets, matches, last_price=0):
+    is_bowler = (wickets >= 12) or (wickets > matches * 0.8) if matches > 0 else False
+    is_allrounder = (runs > 200) and (wickets >= 6)
+    
+    role = "Batter"
+    perf_ratio = 0.0
+
+    if is_allrounder:
+        role = "All-Rounder"
+        bat_ratio = min(runs / IDEAL_AR_RUNS, 1.2) if IDEAL_AR_RUNS > 0 else 0
+        bowl_ratio = min(wickets / IDEAL_AR_WKTS, 1.2) if IDEAL_AR_WKTS > 0 else 0
+        perf_ratio = (bat_ratio * 0.6) + (bowl_ratio * 0.4)
+    elif is_bowler:
+        role = "Bowler"
+        perf_ratio = min(wickets / IDEAL_BOWL_WKTS, 1.1) if IDEAL_BOWL_WKTS > 0 else 0
+    else:
+        role = "Batter"
+        perf_ratio = min(runs / IDEAL_BAT_RUNS, 1.1) if IDEAL_BAT_RUNS > 0 else 0
+
+    base_perf_price = perf_ratio * MAX_PRICE_CAP
+    
+    if last_price > 0:
+        final_price = (0.70 * last_price) + (0.30 * base_perf_price)
+    else:
+        final_price = base_perf_price * 0.85
+        
+    return final_price, role, perf_ratio * 100
+
+def batch_valuation(runs, wickets=None, matches=None, last_price=0):
+    # Same role rules and caps as calculate_valuation, one row per input.
+    # Accepts arrays, or a single DataFrame with runs/wickets/matches
+    # (and optionally last_price) columns.
+    if isinstance(runs, pd.DataFrame):
+        frame = runs
+        runs, wickets, matches = frame['runs'], frame['wickets'], frame['matches']
+        last_price = frame['last_price'] if 'last_price' in frame else 0
+
+    runs = np.asarray(runs, dtype=float)
+    wickets = np.asarray(wickets, dtype=float)
+    matches = np.asarray(matches, dtype=float)
+    runs, wickets, matches, last_price = np.broadcast_arrays(runs, wickets, matches, np.asarray(last_price, dtype=float))
+
+    is_bowler = (matches > 0) & ((wickets >= 12) | (wickets > matches * 0.8))
+    is_allrounder = (runs > 200) & (wickets >= 6)
+
+    bat_ratio = np.minimum(runs / IDEAL_AR_RUNS, 1.2)
+    bowl_ratio = np.minimum(wickets / IDEAL_AR_WKTS, 1.2)
+    perf_ratio = np.select(
+        [is_allrounder, is_bowler],
+        [(bat_ratio * 0.6) + (bowl_ratio * 0.4), np.minimum(wickets / IDEAL_BOWL_WKTS, 1.1)],
+        default=np.minimum(runs / IDEAL_BAT_RUNS, 1.1),
+    )
+    role = np.select([is_allrounder, is_bowler], ["All-Rounder", "Bowler"], default="Batter")
+
+    base_perf_price = perf_ratio * MAX_PRICE_CAP
+    price = np.where(last_price > 0, (0.70 * last_price) + (0.30 * base_perf_price), base_perf_price * 0.85)
+
+    return pd.DataFrame({'price': price, 'role': role, 'perf_score': perf_ratio * 100})
+
+def value_roster(df_stats, df_master):
+    # Values every (player, season) line in df_stats. The last price is the
+    # player's most recent auction at or before that season.
+    roster = df_stats[['Player_Name', 'player_key', 'Year', 'Runs_Scored', 'Wickets_Taken', 'Matches_Batted']]
+    roster = roster.dropna(subset=['player_key']).sort_values('Year', kind='stable')
+    auctions = (df_master[['player_key', 'Year', 'Price']]
+                .dropna(subset=['player_key'])
+                .sort_values('Year', kind='stable')
+                .rename(columns={'Price': 'last_price'}))
+
+    roster = pd.merge_asof(roster, auctions, on='Year', by='player_key', direction='backward')
+    roster['last_price'] = roster['last_price'].fillna(0)
+
+    valued = batch_valuation(roster['Runs_Scored'], roster['Wickets_Taken'], roster['Matches_Batted'],
+                             last_price=roster['last_price'])
+    roster = pd.concat([roster.reset_index(drop=True), valued], axis=1)
+    return roster.drop(columns=['player_key'])
+
+# --- SIMULATION ---
+SIMULATION_RUNS = 5000
+HISTORY_HALF_LIFE = 2.0     # seasons; recent seasons are drawn more often
+SEASON_JITTER = 0.15        # extra log-normal spread on top of the player's own seasons
+DEFAULT_SPREAD = 0.35       # log-normal spread when there's too little history
+VALUATION_PERCENTILES = [5, 25, 50, 75, 95]
+
+def season_factors(history):
+    # Each past season's per-match runs and wickets relative to the player's
+    # average, plus a recency weight per season. None with < 2 usable seasons.
+    if history is None or len(history) < 2:
+        return None
+    h = history[history['Matches_Batted'] > 0]
+    if len(h) < 2:
+        return None
+    runs_rate = h['Runs_Scored'].to_numpy(float) / h['Matches_Batted'].to_numpy(float)
+    wkts_rate = h['Wickets_Taken'].to_numpy(float) / h['Matches_Batted'].to_numpy(float)
+    runs_f = runs_rate / runs_rate.mean() if runs_rate.mean() > 0 else np.ones(len(h))
+    wkts_f = wkts_rate / wkts_rate.mean() if wkts_rate.mean() > 0 else np.ones(len(h))
+    age = h['Year'].max() - h['Year'].to_numpy(float)
+    weights = 0.5 ** (age / HISTORY_HALF_LIFE)
+    return runs_f, wkts_f, weights / weights.sum()
+
+def simulate_valuation(runs, wickets, matches, last_price=0, history=None, n=SIMULATION_RUNS, seed=0):
+    # Samples n seasons around the given stat line and values them all in
+    # one batch_valuation call. Each sample borrows the shape of one of the
+    # player's past seasons (runs and wickets move together), with some
+    # log-normal noise; wickets are Poisson around their sampled mean.
+    rng = np.random.default_rng(seed)
+    factors = season_factors(history)
+    if factors is None:
+        runs_f = rng.lognormal(0, DEFAULT_SPREAD, n)
+        wkts_f = rng.lognormal(0, DEFAULT_SPREAD, n)
+    else:
+        pick = rng.choice(len(factors[2]), size=n, p=factors[2])
+        runs_f = factors[0][pick] * rng.lognormal(0, SEASON_JITTER, n)
+        wkts_f = factors[1][pick] * rng.lognormal(0, SEASON_JITTER, n)
+
+    sim_runs = np.round(runs * runs_f)
+    sim_wkts = rng.poisson(wickets * wkts_f)
+    sims = batch_valuation(sim_runs, sim_wkts, matches, last_price=last_price)
+    sims.insert(0, 'runs', sim_runs.astype(int))
+    sims.insert(1, 'wickets', sim_wkts)
+    return sims
+
+def valuation_bands(prices, percentiles=VALUATION_PERCENTILES):
+    return dict(zip(percentiles, np.percentile(prices, percentiles)))